@@ -1,8 +1,17 @@
 # algoritmo_coloracao.py
+import logging
+import sys
 import time
-from typing import List, Tuple, Set, List as TList
+from typing import List, NamedTuple, Optional, Tuple, Set, List as TList
 from heapq import heappush, heappop
+import numpy as np
 from leitor_arquivos import ler_arquivo
+from grafo_csr import faixas_csr
+from heap_indexado import HeapIndexado
+from instrumentacao import fase, instrumentado, perfil_de
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 # ========================================================
 # Helpers gerais
@@ -10,73 +19,31 @@ from leitor_arquivos import ler_arquivo
 # 1) Vizinhança NÃO-DIRECIONADA (para coloração)
 # 2) Adjacência e lista de arestas NÃO-DIRECIONADAS com pesos (para AGM)
 
+# Todos usam a vista em cache do grafo (Grafo.visao_nao_direcionada): montada
+# uma vez por versão do grafo, não uma vez por heurística.
+
 def build_undirected_adj(grafo) -> TList[Set[int]]:
-    n = len(grafo.vertices)
-    adj: TList[Set[int]] = [set() for _ in range(n)]
-    for u in range(n):
-        for v in grafo.retornar_vizinhos(u):
-            if u == v:
-                continue
-            adj[u].add(v)
-            adj[v].add(u)
-    return adj
-
-
-def _peso_undirected(grafo, u: int, v: int):
-    """Peso da aresta não-direcionada {u,v}. Em grafos direcionados, usa min(u->v, v->u).
-    Em grafos não ponderados retorna 1.0. Se não existir em nenhum sentido, retorna None."""
-    w1 = grafo.peso_aresta(u, v)
-    w2 = grafo.peso_aresta(v, u)
-    if w1 is None and w2 is None:
-        return None
-    if not grafo.ponderado:
-        return 1.0
-    if w1 is None:
-        return float(w2)
-    if w2 is None:
-        return float(w1)
-    return float(min(w1, w2))
+    """Vizinhança não-direcionada sem laços (sets compartilhados: não modificar)."""
+    return grafo.visao_nao_direcionada().conjuntos()
 
 
 def adj_undirected_weighted(grafo):
-    n = len(grafo.vertices)
-    adj = [[] for _ in range(n)]
-    for u in range(n):
-        for v in grafo.retornar_vizinhos(u):
-            if u == v:
-                continue
-            w = _peso_undirected(grafo, u, v)
-            if w is None:
-                continue
-            adj[u].append((v, w))
-            adj[v].append((u, w))
-    # dedup por menor peso
-    for u in range(n):
-        best = {}
-        for v, w in adj[u]:
-            if v not in best or w < best[v]:
-                best[v] = w
-        adj[u] = [(v, best[v]) for v in best]
-    return adj
+    """[(vizinho, peso)] por vértice; direcionado usa min(a->b, b->a)."""
+    return grafo.visao_nao_direcionada().adjacencia_ponderada()
 
 
 def edge_list_undirected(grafo):
-    n = len(grafo.vertices)
-    edges = []
-    seen = set()
-    for u in range(n):
-        for v in grafo.retornar_vizinhos(u):
-            if u == v:
-                continue
-            a, b = (u, v) if u < v else (v, u)
-            if (a, b) in seen:
-                continue
-            w = _peso_undirected(grafo, a, b)
-            if w is None:
-                continue
-            seen.add((a, b))
-            edges.append((w, a, b))
-    return edges
+    """[(peso, a, b)], a < b, na ordem em que cada par aparece primeiro."""
+    return grafo.visao_nao_direcionada().lista_arestas()
+
+
+def is_valid_coloring(grafo, coloracao) -> bool:
+    """Vetorizado sobre as arestas da vista: nenhuma com as duas pontas da mesma cor."""
+    visao = grafo.visao_nao_direcionada()
+    cor = np.asarray(coloracao)
+    if cor.shape != (visao.n,):
+        return False
+    return not np.any(cor[visao.origens] == cor[visao.destinos])
 
 
 def is_valid_coloring_adj(adj: TList[Set[int]], coloracao: TList[int]) -> bool:
@@ -90,6 +57,12 @@ def is_valid_coloring_adj(adj: TList[Set[int]], coloracao: TList[int]) -> bool:
 # Coloração
 # ========================================================
 
+# Harness: coloração exata até LIMITE_FORCA_BRUTA vértices, com orçamento de
+# TEMPO_FORCA_BRUTA segundos (estourou = melhor coloração achada até ali,
+# marcada no relatório como não provada)
+LIMITE_FORCA_BRUTA = 1000
+TEMPO_FORCA_BRUTA = 10.0
+
 def backtrack_coloracao(adj: TList[Set[int]], coloracao: TList[int], v: int, k: int) -> bool:
     n = len(adj)
     if v == n:
@@ -105,72 +78,272 @@ def backtrack_coloracao(adj: TList[Set[int]], coloracao: TList[int], v: int, k:
     return False
 
 
-def forca_bruta_coloracao(grafo):
-    n = len(grafo.vertices)
+class ResultadoColoracaoExata(NamedTuple):
+    coloracao: TList[int]
+    cores: int               # melhor limite superior achado
+    limite_inferior: int     # tamanho da clique gulosa
+    otimo: bool              # False se o tempo acabou antes de provar
+
+
+def clique_gulosa(adj: TList[Set[int]], tentativas: int = 32) -> TList[int]:
+    """Clique maximal gulosa a partir dos `tentativas` vértices de maior grau;
+    a cada passo entra o candidato com mais vizinhos entre os candidatos."""
+    n = len(adj)
+    melhor: TList[int] = []
+    for s in sorted(range(n), key=lambda v: -len(adj[v]))[:tentativas]:
+        clique = [s]
+        candidatos = set(adj[s])
+        while candidatos:
+            v = max(candidatos, key=lambda u: len(adj[u] & candidatos))
+            clique.append(v)
+            candidatos &= adj[v]
+        if len(clique) > len(melhor):
+            melhor = clique
+    return melhor
+
+
+def coloracao_exata_adj(adj: TList[Set[int]], limite_tempo: Optional[float] = None,
+                        parar=None) -> ResultadoColoracaoExata:
+    """
+    Número cromático por branch-and-bound com ordem DSATUR (pilha explícita).
+      - limite superior inicial: dsatur_adj; cada solução melhor o reduz;
+      - limite inferior: clique_gulosa, que já entra pré-colorida 0..q-1;
+      - simetria: só se abre UMA cor nova por nó, e só se ainda couber
+        abaixo do limite superior;
+      - próximo vértice: maior saturação, desempate por grau.
+    limite_tempo (segundos): ao estourar devolve a melhor coloração achada
+    com otimo=False. O mesmo vale se `parar` (um Event) for ligado.
+    """
+    n = len(adj)
     if n == 0:
-        return [], 0
-    adj = build_undirected_adj(grafo)
-    if all(len(adj[v]) == 0 for v in range(n)):
-        return [0]*n, 1
-    for k in range(2, n + 1):
-        coloracao = [-1] * n
-        if backtrack_coloracao(adj, coloracao, 0, k):
-            return coloracao, k
-    return [-1] * n, n
+        return ResultadoColoracaoExata([], 0, 0, True)
+    melhor, ub = dsatur_adj(adj)
+    clique = clique_gulosa(adj)
+    lb = len(clique)
+    if lb >= ub:
+        return ResultadoColoracaoExata(melhor, ub, lb, True)
+
+    prazo = None if limite_tempo is None else time.perf_counter() + limite_tempo
+    vizinhos = [list(a) for a in adj]
+    grau = [len(a) for a in adj]
+    cor = [-1] * n
+    contagem = [[0] * ub for _ in range(n)]  # contagem[w][c]: vizinhos de w com cor c
+    dsat = [0] * n
+
+    def pintar(v: int, c: int) -> None:
+        cor[v] = c
+        for w in vizinhos[v]:
+            cw = contagem[w]
+            if cw[c] == 0:
+                dsat[w] += 1
+            cw[c] += 1
+
+    def despintar(v: int) -> None:
+        c = cor[v]
+        cor[v] = -1
+        for w in vizinhos[v]:
+            cw = contagem[w]
+            cw[c] -= 1
+            if cw[c] == 0:
+                dsat[w] -= 1
+
+    for c, v in enumerate(clique):
+        pintar(v, c)
+    usadas = lb
+    restantes = n - lb
+    pilha: TList[TList[int]] = []  # quadros [vértice, próxima cor a tentar, cores usadas antes]
+    passos = 0
+    otimo = True
+    while True:
+        if restantes == 0:
+            melhor, ub = cor[:], usadas
+            if ub <= lb:
+                break
+        else:
+            v, chave = -1, (-1, -1)
+            for u in range(n):
+                if cor[u] == -1 and (dsat[u], grau[u]) > chave:
+                    v, chave = u, (dsat[u], grau[u])
+            pilha.append([v, 0, usadas])
+
+        # avança o quadro do topo para a próxima cor viável (ou desempilha)
+        while pilha:
+            quadro = pilha[-1]
+            v, c, antes = quadro
+            if cor[v] != -1:
+                despintar(v)
+                restantes += 1
+                usadas = antes
+            limite = min(antes, ub - 1)
+            cv = contagem[v]
+            while c < limite and cv[c]:
+                c += 1
+            if c >= limite:
+                c = antes if c == antes and antes + 1 < ub else -1
+            if c < 0:
+                pilha.pop()
+                continue
+            quadro[1] = c + 1
+            pintar(v, c)
+            restantes -= 1
+            usadas = max(antes, c + 1)
+            break
+        else:
+            break
+
+        passos += 1
+        if passos % 1024 == 0 and ((prazo is not None and time.perf_counter() > prazo)
+                                   or (parar is not None and parar.is_set())):
+            otimo = False
+            break
+    return ResultadoColoracaoExata(melhor, ub, lb, otimo)
+
+
+def coloracao_exata(grafo, limite_tempo: Optional[float] = None) -> ResultadoColoracaoExata:
+    return coloracao_exata_adj(build_undirected_adj(grafo), limite_tempo)
+
+
+@instrumentado("forca_bruta")
+def forca_bruta_coloracao(grafo, limite_tempo: Optional[float] = None):
+    """
+    Coloração ótima (coloracao, k) via coloracao_exata. Se o tempo acabar, k
+    é só limite superior; limite inferior e `otimo` vêm de coloracao_exata.
+    """
+    resultado = coloracao_exata(grafo, limite_tempo)
+    return resultado.coloracao, resultado.cores
 
 
 def greedy_by_order(adj: TList[Set[int]], ordem: TList[int]) -> Tuple[TList[int], int]:
+    """Gulosa na ordem dada; cada vértice guarda uma máscara de bits das cores
+    proibidas (int do Python, então não há limite de cores)."""
     n = len(adj)
     cor = [-1] * n
+    proibidas = [0] * n
     for v in ordem:
-        proibidas = { cor[u] for u in adj[v] if cor[u] != -1 }
-        c = 0
-        while c in proibidas:
-            c += 1
+        m = proibidas[v]
+        c = (~m & (m + 1)).bit_length() - 1  # menor bit zerado
         cor[v] = c
-    k = max(cor) + 1 if max(cor) >= 0 else 0
+        bit = 1 << c
+        for u in adj[v]:
+            proibidas[u] |= bit
+    k = max(cor) + 1 if n > 0 else 0
     return cor, k
 
 
-def heuristica_welsh_powell(grafo):
-    adj = build_undirected_adj(grafo)
-    graus = [(v, len(adj[v])) for v in range(len(adj))]
-    ordem = [v for v, _ in sorted(graus, key=lambda x: -x[1])]
-    return greedy_by_order(adj, ordem)
+def greedy_bitmask(visao, ordem) -> Tuple[TList[int], int]:
+    """greedy_by_order direto sobre o CSR da VisaoNaoDirecionada, sem montar sets."""
+    ptr, ind = visao.indptr.tolist(), visao.indices.tolist()
+    cor = [-1] * visao.n
+    proibidas = [0] * visao.n
+    for v in ordem:
+        m = proibidas[v]
+        c = (~m & (m + 1)).bit_length() - 1
+        cor[v] = c
+        bit = 1 << c
+        for u in ind[ptr[v]:ptr[v + 1]]:
+            proibidas[u] |= bit
+    k = max(cor) + 1 if visao.n > 0 else 0
+    return cor, k
 
 
-def heuristica_dsat(grafo):
-    adj = build_undirected_adj(grafo)
+# np.bitwise_count só existe a partir do NumPy 2.0; antes, tabela por byte
+_BITS_POR_BYTE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _contar_bits(x: np.ndarray) -> np.ndarray:
+    """Bits ligados de cada elemento de um array uint64."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    bytes_ = np.ascontiguousarray(x).view(np.uint8).reshape(x.shape + (8,))
+    return _BITS_POR_BYTE[bytes_].sum(axis=-1)
+
+
+def greedy_batch(visao, ordens) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gulosa para B ordens de uma vez (ordens: array B×V, cada linha uma
+    permutação). Passo t colore ordens[:, t] em todas as linhas com operações
+    vetorizadas; as cores proibidas ficam em máscaras uint64 (B×V). Linhas que
+    passam de 64 cores são refeitas com greedy_bitmask.
+    Retorna (cores B×V, k por linha).
+    """
+    ordens = np.asarray(ordens, dtype=np.int64)
+    b, n = ordens.shape
+    cores = np.full((b, n), -1, dtype=np.int64)
+    mascaras = np.zeros((b, n), dtype=np.uint64)
+    estourou = np.zeros(b, dtype=bool)
+    linhas = np.arange(b)
+    um = np.uint64(1)
+    for t in range(n):
+        v = ordens[:, t]
+        m = mascaras[linhas, v]
+        livre = ~m & (m + um)          # menor bit zerado (0 se todos os 64 estão usados)
+        estourou |= livre == 0
+        c = _contar_bits(livre - um).astype(np.int64)
+        cores[linhas, v] = c
+        inicios = visao.indptr[v]
+        posicoes, faixa = faixas_csr(inicios, visao.indptr[v + 1] - inicios)
+        # sem pares repetidos (uma linha por ordem, vizinhos distintos): |= direto
+        mascaras[faixa, visao.indices[posicoes]] |= livre[faixa]
+    for i in np.flatnonzero(estourou):
+        cores[i] = greedy_bitmask(visao, ordens[i].tolist())[0]
+    k = cores.max(axis=1) + 1 if n > 0 else np.zeros(b, dtype=np.int64)
+    return cores, k
+
+
+@instrumentado("welsh_powell")
+def heuristica_welsh_powell(grafo):
+    visao = grafo.visao_nao_direcionada()
+    ordem = np.argsort(-visao.grau(), kind="stable")  # mesmo desempate do sorted estável
+    return greedy_bitmask(visao, ordem.tolist())
+
+
+def dsatur_adj(adj: TList[Set[int]], perfil=None) -> Tuple[TList[int], int]:
+    """
+    DSATUR incremental: cada vértice guarda o conjunto de cores vizinhas, que
+    só cresce, e a escolha do próximo vértice sai de um heap preguiçoso com
+    chave (-dsat, -grau, -v). Entradas velhas (dsat desatualizado ou vértice
+    já colorido) são descartadas no pop. O((V+E) log V) no total.
+    Desempate igual ao max((dsat, grau, v)) original: maior grau, depois
+    maior índice, então a coloração é a mesma de sempre.
+    `perfil` (instrumentacao.Perfil) conta os pushes/pops do heap.
+    """
     n = len(adj)
     cor = [-1] * n
-    dsat = [0] * n
-    grau = [len(adj[v]) for v in range(n)]
-
-    def recomputa_dsat(v: int):
-        viz_cores = { cor[u] for u in adj[v] if cor[u] != -1 }
-        dsat[v] = len(viz_cores)
-
-    for _ in range(n):
-        cand = [(dsat[v], grau[v], v) for v in range(n) if cor[v] == -1]
-        if not cand:
-            break
-        _, _, u = max(cand)
-        proibidas = { cor[x] for x in adj[u] if cor[x] != -1 }
+    cores_vizinhas: TList[Set[int]] = [set() for _ in range(n)]
+    heap = [(0, -len(adj[v]), -v) for v in range(n)]
+    heap.sort()  # lista ordenada já é um heap
+    push, pop = heappush, heappop
+    if perfil is not None:
+        push = perfil.contando(push, "heap_push")
+        pop = perfil.contando(pop, "heap_pop")
+        perfil.contar("heap_push", n)
+    while heap:
+        menos_dsat, menos_grau, menos_v = pop(heap)
+        u = -menos_v
+        if cor[u] != -1 or -menos_dsat != len(cores_vizinhas[u]):
+            continue
+        proibidas = cores_vizinhas[u]
         c = 0
         while c in proibidas:
             c += 1
         cor[u] = c
         for w in adj[u]:
-            if cor[w] == -1:
-                recomputa_dsat(w)
-    k = max(cor) + 1 if max(cor) >= 0 else 0
+            if cor[w] == -1 and c not in cores_vizinhas[w]:
+                cores_vizinhas[w].add(c)
+                push(heap, (-len(cores_vizinhas[w]), -len(adj[w]), -w))
+    k = max(cor) + 1 if n > 0 else 0
     return cor, k
 
 
+@instrumentado("dsatur")
+def heuristica_dsat(grafo):
+    return dsatur_adj(build_undirected_adj(grafo), perfil_de(grafo))
+
+
+@instrumentado("heuristica_simples")
 def heuristica_simples(grafo):
-    adj = build_undirected_adj(grafo)
-    ordem = list(range(len(adj)))
-    return greedy_by_order(adj, ordem)
+    visao = grafo.visao_nao_direcionada()
+    return greedy_bitmask(visao, range(visao.n))
 
 
 def testar_coloracao(nome_arquivo):
@@ -181,25 +354,27 @@ def testar_coloracao(nome_arquivo):
     print(f"\n--- Testando: {nome_arquivo} ---")
     print("Número de vértices:", len(grafo.vertices))
     for nome, func in [
-        ("Força Bruta", forca_bruta_coloracao),
+        ("Força Bruta", lambda g: coloracao_exata(g, TEMPO_FORCA_BRUTA)),
         ("Welsh-Powell", heuristica_welsh_powell),
         ("DSATUR", heuristica_dsat),
         ("Heurística Simples", heuristica_simples)
     ]:
-        if nome == "Força Bruta" and len(grafo.vertices) > 12:
+        if nome == "Força Bruta" and len(grafo.vertices) > LIMITE_FORCA_BRUTA:
             print(f"{nome}: ignorado (grafo muito grande)")
             continue
         ini = time.time()
-        coloracao, num_cores = func(grafo)
+        resultado = func(grafo)
         fim = time.time()
-        adj = build_undirected_adj(grafo)
-        valido = is_valid_coloring_adj(adj, coloracao)
+        coloracao, num_cores = resultado[:2]
+        provado = getattr(resultado, "otimo", True)
+        valido = is_valid_coloring(grafo, coloracao)
         if not valido:
             print(f"⚠️ {nome}: coloração inválida!")
-        elif num_cores <= 1 and any(len(a) > 0 for a in adj):
+        elif num_cores <= 1 and len(grafo.visao_nao_direcionada().origens) > 0:
             print(f"⚠️ {nome}: cores insuficientes (1), havia arestas!")
         else:
-            print(f"{nome}: {num_cores} cores válidas em {fim - ini:.4f}s")
+            aviso = "" if provado else " (tempo esgotado: limite superior, ótimo não provado)"
+            print(f"{nome}: {num_cores} cores válidas em {fim - ini:.4f}s{aviso}")
         if len(grafo.vertices) <= 10:
             print("Vértices e cores:", list(enumerate(coloracao)))
 
@@ -207,13 +382,90 @@ def testar_coloracao(nome_arquivo):
 # Árvores Geradoras Mínimas (AGM): Prim e Kruskal 
 # ========================================================
 
-def prim(grafo):
-    """Prim (E log V) com heap; retorna FLORESTA mínima se o grafo for desconexo."""
-    n = len(grafo.vertices)
-    if n == 0:
-        print("❌ Grafo vazio.")
-        return [], 0.0
-    adj = adj_undirected_weighted(grafo)
+MODOS_PRIM = ("auto", "denso", "indexado", "heap")
+# auto: O(V²) em arrays quando a densidade passa disso (e a matriz cabe)
+DENSIDADE_PRIM_DENSO = 0.05
+MAX_V_PRIM_DENSO = 2048  # grafos sem GrafoMatriz: matriz V×V float64 montada na hora (até 32 MiB)
+
+
+def _matriz_pesos_densa(grafo):
+    """
+    Função v -> linha v da matriz de pesos simétrica (np.inf = sem aresta).
+    GrafoMatriz não-direcionado usa a própria matriz, linha a linha; os
+    demais montam uma matriz V×V a partir da vista não-direcionada.
+    """
+    matriz = getattr(grafo, "matriz", None)
+    if matriz is not None and not grafo.direcionado:
+        inf = np.float32(np.inf)
+        return lambda v: np.where(matriz[v] != 0, matriz[v], inf)
+    visao = grafo.visao_nao_direcionada()
+    pesos = np.full((visao.n, visao.n), np.inf)
+    pesos[visao.origens, visao.destinos] = visao.pesos
+    pesos[visao.destinos, visao.origens] = visao.pesos
+    return pesos.__getitem__
+
+
+def _prim_denso(n: int, linha, perfil=None):
+    """Prim O(V²): vetor de chaves + argmin, sem heap. Florestas começam no
+    menor vértice ainda fora; empates vão para o menor índice."""
+    chave = np.full(n, np.inf)
+    pai = np.full(n, -1, dtype=np.int64)
+    fora = np.ones(n, dtype=bool)
+    mst = []
+    total = 0.0
+    for _ in range(n):
+        candidatos = np.where(fora, chave, np.inf)
+        v = int(np.argmin(candidatos))
+        if candidatos[v] == np.inf:
+            v = int(np.argmax(fora))  # nova árvore
+        else:
+            w = float(chave[v])
+            mst.append((int(pai[v]), v, w))
+            total += w
+        fora[v] = False
+        pesos_v = linha(v)
+        melhora = fora & (pesos_v < chave)
+        chave[melhora] = pesos_v[melhora]
+        pai[melhora] = v
+        if perfil is not None:
+            perfil.contar("relaxacoes", int(np.count_nonzero(melhora)))
+    return mst, total
+
+
+def _prim_indexado(n: int, adj, perfil=None):
+    """Prim com HeapIndexado: no máximo V itens no heap. A chave (w, u, v) dá
+    exatamente as mesmas arestas, na mesma ordem, do Prim com heapq."""
+    na_arvore = [False] * n
+    heap = HeapIndexado(n)
+    inserir, extrair = heap.inserir_ou_diminuir, heap.extrair_min
+    if perfil is not None:
+        inserir = perfil.contando(inserir, "heap_push", sucesso="relaxacoes")
+        extrair = perfil.contando(extrair, "heap_pop")
+    mst = []
+    total = 0.0
+    for s in range(n):
+        if na_arvore[s]:
+            continue
+        na_arvore[s] = True
+        for v, w in adj[s]:
+            inserir(v, (w, s, v))
+        while heap:
+            v, (w, u, _) = extrair()
+            na_arvore[v] = True
+            mst.append((u, v, w))
+            total += w
+            for x, wx in adj[v]:
+                if not na_arvore[x]:
+                    inserir(x, (wx, v, x))
+    return mst, total
+
+
+def _prim_heap(n: int, adj, perfil=None):
+    """Prim com heapq e entradas repetidas (heap até O(E))."""
+    push, pop = heappush, heappop
+    if perfil is not None:
+        push = perfil.contando(push, "heap_push", "relaxacoes")
+        pop = perfil.contando(pop, "heap_pop")
     visitado = [False] * n
     mst = []
     total = 0.0
@@ -223,9 +475,9 @@ def prim(grafo):
         visitado[s] = True
         heap = []
         for v, w in adj[s]:
-            heappush(heap, (w, s, v))
+            push(heap, (w, s, v))
         while heap:
-            w, u, v = heappop(heap)
+            w, u, v = pop(heap)
             if visitado[v]:
                 continue
             visitado[v] = True
@@ -233,50 +485,121 @@ def prim(grafo):
             total += w
             for x, wx in adj[v]:
                 if not visitado[x]:
-                    heappush(heap, (wx, v, x))
-    print(f"🌲 Prim: {len(mst)} arestas, soma = {total:.2f}")
+                    push(heap, (wx, v, x))
     return mst, total
 
 
-def kruskal(grafo):
-    """Kruskal com Union-Find; retorna FLORESTA mínima se desconexo."""
+@instrumentado("prim")
+def prim(grafo, modo: str = "auto"):
+    """
+    Prim; retorna FLORESTA mínima se o grafo for desconexo.
+      modo="denso":    O(V²) em arrays (bom para grafos densos / GrafoMatriz)
+      modo="indexado": heap com decrease-key, O(E log V) com heap <= V
+      modo="heap":     heapq com entradas repetidas (versão original)
+      modo="auto":     denso se densidade >= DENSIDADE_PRIM_DENSO (e a
+                       matriz couber), senão indexado
+    Mesmo peso total em todos os modos; com pesos empatados o "denso" pode
+    escolher outras arestas.
+    """
+    if modo not in MODOS_PRIM:
+        raise ValueError(f"Modo desconhecido: {modo!r}")
     n = len(grafo.vertices)
     if n == 0:
-        print("❌ Grafo vazio.")
+        logger.warning("❌ Grafo vazio.")
         return [], 0.0
-    edges = edge_list_undirected(grafo)
-    edges.sort(key=lambda x: x[0])
-    parent = list(range(n))
-    rank = [0] * n
-    def find(a):
-        if parent[a] != a:
-            parent[a] = find(parent[a])
-        return parent[a]
-    def union(a, b):
-        ra, rb = find(a), find(b)
-        if ra == rb:
-            return False
-        if rank[ra] < rank[rb]:
-            parent[ra] = rb
-        elif rank[ra] > rank[rb]:
-            parent[rb] = ra
+    if modo == "auto":
+        matriz = getattr(grafo, "matriz", None)
+        if matriz is not None and not grafo.direcionado:
+            # a própria matriz já serve ao modo denso: conta as arestas nela,
+            # sem montar a vista não-direcionada
+            m = (np.count_nonzero(matriz) - np.count_nonzero(np.diagonal(matriz))) // 2
+            cabe = True
         else:
-            parent[rb] = ra
-            rank[ra] += 1
-        return True
-    mst = []
-    total = 0.0
-    for w, u, v in edges:
-        if union(u, v):
-            mst.append((u, v, w))
-            total += w
-    print(f"🌲 Kruskal: {len(mst)} arestas, soma = {total:.2f}")
+            m = len(grafo.visao_nao_direcionada().origens)
+            cabe = n <= MAX_V_PRIM_DENSO
+        densidade = 2 * m / (n * (n - 1)) if n > 1 else 0.0
+        modo = "denso" if densidade >= DENSIDADE_PRIM_DENSO and cabe else "indexado"
+    perfil = perfil_de(grafo)
+    if modo == "denso":
+        mst, total = _prim_denso(n, _matriz_pesos_densa(grafo), perfil)
+    elif modo == "indexado":
+        mst, total = _prim_indexado(n, adj_undirected_weighted(grafo), perfil)
+    else:
+        mst, total = _prim_heap(n, adj_undirected_weighted(grafo), perfil)
+    logger.info("🌲 Prim: %d arestas, soma = %.2f", len(mst), total)
     return mst, total
 
+
+def kruskal_arrays(n: int, pesos: np.ndarray, origens: np.ndarray,
+                   destinos: np.ndarray) -> Tuple[np.ndarray, float, np.ndarray]:
+    """
+    Kruskal sobre arrays de arestas: argsort estável por peso e Union-Find
+    iterativo (path halving + união por tamanho) em arrays int32 acessados por
+    memoryview. Para assim que aceita n-1 arestas.
+    Retorna (índices das arestas aceitas, na ordem de aceitação; peso total;
+    rótulo da componente de cada vértice, 0..c-1 na ordem do menor vértice).
+    """
+    ordem = np.argsort(pesos, kind="stable")
+    pai_arr = np.arange(n, dtype=np.int32)
+    pai = memoryview(pai_arr)
+    tamanho = memoryview(np.ones(n, dtype=np.int32))
+    aceitas: TList[int] = []
+    alvo = n - 1
+    for i, (a, b) in enumerate(zip(origens[ordem].tolist(), destinos[ordem].tolist())):
+        while pai[a] != a:
+            pai[a] = pai[pai[a]]
+            a = pai[a]
+        while pai[b] != b:
+            pai[b] = pai[pai[b]]
+            b = pai[b]
+        if a == b:
+            continue
+        if tamanho[a] < tamanho[b]:
+            a, b = b, a
+        pai[b] = a
+        tamanho[a] += tamanho[b]
+        aceitas.append(i)
+        if len(aceitas) == alvo:
+            break
+    escolhidas = ordem[np.array(aceitas, dtype=np.int64)]
+    total = sum(pesos[escolhidas].tolist(), 0.0)  # soma na ordem de aceitação, como antes
+
+    # rótulos: salta ponteiros até todo vértice apontar para a raiz
+    raiz = pai_arr
+    while True:
+        proximo = raiz[raiz]
+        if np.array_equal(proximo, raiz):
+            break
+        raiz = proximo
+    _, primeiro, inverso = np.unique(raiz, return_index=True, return_inverse=True)
+    rotulos = np.argsort(np.argsort(primeiro))[inverso]
+    return escolhidas, total, rotulos
+
+
+@instrumentado("kruskal")
+def kruskal(grafo, rotulos: bool = False):
+    """
+    Kruskal com Union-Find; retorna FLORESTA mínima se desconexo.
+    rotulos=True devolve (mst, total, componente de cada vértice), com os
+    rótulos que o próprio Union-Find já deixou (ver kruskal_arrays).
+    """
+    n = len(grafo.vertices)
+    if n == 0:
+        logger.warning("❌ Grafo vazio.")
+        return ([], 0.0, np.empty(0, dtype=np.int64)) if rotulos else ([], 0.0)
+    visao = grafo.visao_nao_direcionada()
+    with fase(grafo, "kruskal_uniao_busca"):
+        escolhidas, total, componentes = kruskal_arrays(n, visao.pesos, visao.origens, visao.destinos)
+    mst = list(zip(visao.origens[escolhidas].tolist(), visao.destinos[escolhidas].tolist(),
+                   visao.pesos[escolhidas].tolist()))
+    logger.info("🌲 Kruskal: %d arestas, soma = %.2f", len(mst), total)
+    return (mst, total, componentes) if rotulos else (mst, total)
+
 # ========================================================
 # Execução principal (testes)
 # ========================================================
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     arquivos_teste = [
         "espacoaereo.txt",
         "grafo_direcionado_Ponderado_Direcionado.txt",
@@ -307,26 +630,28 @@ if __name__ == "__main__":
         print("   └──────────────────────────────────────────────")
 
         for nome_alg, func in [
-            ("Força Bruta", forca_bruta_coloracao),
+            ("Força Bruta", lambda g: coloracao_exata(g, TEMPO_FORCA_BRUTA)),
             ("Welsh-Powell", heuristica_welsh_powell),
             ("DSATUR", heuristica_dsat),
             ("Heurística Simples", heuristica_simples)
         ]:
-            if nome_alg == "Força Bruta" and len(grafo.vertices) > 12:
+            if nome_alg == "Força Bruta" and len(grafo.vertices) > LIMITE_FORCA_BRUTA:
                 print(f"      ⚙️  {nome_alg:<20} → ignorado (grafo muito grande)")
                 continue
 
             ini = time.time()
-            coloracao, num_cores = func(grafo)
+            resultado = func(grafo)
             fim = time.time()
             tempo = fim - ini
-            adj = build_undirected_adj(grafo)
-            valido = is_valid_coloring_adj(adj, coloracao)
+            coloracao, num_cores = resultado[:2]
+            valido = is_valid_coloring(grafo, coloracao)
 
             if not valido:
                 status = "⚠️  Coloração inválida"
-            elif num_cores <= 1 and any(len(a) > 0 for a in adj):
+            elif num_cores <= 1 and len(grafo.visao_nao_direcionada().origens) > 0:
                 status = "⚠️  Cores insuficientes"
+            elif not getattr(resultado, "otimo", True):
+                status = "✅ Válida (tempo esgotado, ótimo não provado)"
             else:
                 status = "✅ Válida"
 
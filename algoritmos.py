@@ -1,96 +1,319 @@
+# algoritmos.py
+"""
+Núcleo único de BFS, DFS e Dijkstra. Grafo.bfs/dfs/dijkstra e as funções
+busca_em_largura/busca_em_profundidade/dijkstra daqui são só embrulhos.
+
+Os laços pegam os vizinhos pelo acesso direto de cada backend, sem copiar o
+grafo (Grafo._acesso_vizinhos/_acesso_ponderado): GrafoLista lê lista_adj,
+GrafoCSR lê as fatias de indptr/indices/pesos (memmap e memória compartilhada
+continuam sem cópia). Grafo com `matriz` usa o Dijkstra O(V²) vetorizado.
+Grafo.ativar_adjacencia_compacta() troca isso por listas Python por vértice,
+montadas uma vez por versão do grafo: mais rápido para muitas consultas sem
+alterações no meio, ao custo de uma cópia O(V+E) em objetos Python.
+Com instrumentacao.instrumentar ativo os métodos do grafo voltam a ser usados,
+para que as consultas sejam contadas.
+"""
 from collections import deque
 import heapq
-from typing import List, Tuple, Dict
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
+from caminhos import ResultadoDijkstra
+
+
+class AdjacenciaCompacta(NamedTuple):
+    """Por vértice: vizinhos (int) e pesos (float, 1.0 se não ponderado), na ordem do backend."""
+    vizinhos: List[List[int]]
+    pesos: List[List[float]]
+
+
+def adjacencia_compacta(indptr, indices, pesos=None) -> AdjacenciaCompacta:
+    """Listas por vértice a partir de arrays CSR."""
+    ptr = np.asarray(indptr).tolist()
+    ind = np.asarray(indices).tolist()
+    ws = np.asarray(pesos, dtype=np.float64).tolist() if pesos is not None else [1.0] * len(ind)
+    faixas = list(zip(ptr, ptr[1:]))
+    return AdjacenciaCompacta([ind[a:b] for a, b in faixas], [ws[a:b] for a, b in faixas])
+
+
+def vizinhanca_csr(indptr, indices) -> Callable[[int], List[int]]:
+    """v -> vizinhos lidos da fatia de `indices` (sem cópia do grafo)."""
+    return lambda v: indices[indptr[v]:indptr[v + 1]].tolist()
+
+
+def vizinhanca_ponderada_csr(indptr, indices, pesos=None) -> Callable[[int], Iterable[Tuple[int, float]]]:
+    """v -> pares (vizinho, peso) lidos das fatias CSR; peso 1.0 sem `pesos`."""
+    if pesos is None:
+        return lambda v: [(u, 1.0) for u in indices[indptr[v]:indptr[v + 1]].tolist()]
+
+    def vizinhos(v):
+        ini, fim = indptr[v], indptr[v + 1]
+        return zip(indices[ini:fim].tolist(), pesos[ini:fim].tolist())
+    return vizinhos
+
+
+def vizinhanca(grafo) -> Callable[[int], Iterable[int]]:
+    """Função v -> vizinhos de v para os laços do núcleo."""
+    if getattr(grafo, "_perfil", None) is not None:
+        return grafo.retornar_vizinhos
+    if getattr(grafo, "_usar_compacta", False):
+        return grafo.adjacencia_compacta().vizinhos.__getitem__
+    acesso = getattr(grafo, "_acesso_vizinhos", None)
+    return grafo.retornar_vizinhos if acesso is None else acesso()
+
+
+def acesso_ponderado(compacta: AdjacenciaCompacta) -> Callable[[int], Iterable[Tuple[int, float]]]:
+    vizinhos, pesos = compacta
+    return lambda v: zip(vizinhos[v], pesos[v])
+
+
+def vizinhanca_ponderada(grafo) -> Callable[[int], Iterable[Tuple[int, float]]]:
+    """Função v -> pares (vizinho, peso) para os laços do núcleo."""
+    if getattr(grafo, "_perfil", None) is not None:
+        return grafo.vizinhos_com_peso
+    if getattr(grafo, "_usar_compacta", False):
+        return acesso_ponderado(grafo.adjacencia_compacta())
+    acesso = getattr(grafo, "_acesso_ponderado", None)
+    return grafo.vizinhos_com_peso if acesso is None else acesso()
+
 
 def busca_em_largura(grafo, origem: int) -> List[int]:
     """Busca em Largura (BFS) - retorna ordem de visitação"""
-    if origem < 0 or origem >= len(grafo.vertices):
+    n = len(grafo.vertices)
+    if origem < 0 or origem >= n:
         return []
-    
-    visitados = [False] * len(grafo.vertices)
+    vizinhos = vizinhanca(grafo)
+    visitados = [False] * n
+    origem = int(origem)
     fila = deque([origem])
     visitados[origem] = True
     ordem_visita = []
-    
     while fila:
         vertice = fila.popleft()
         ordem_visita.append(vertice)
-        
-        for vizinho in grafo.retornar_vizinhos(vertice):
+        for vizinho in vizinhos(vertice):
             if not visitados[vizinho]:
                 visitados[vizinho] = True
-                fila.append(vizinho)
-    
+                fila.append(int(vizinho))
     return ordem_visita
 
+class ResultadoBFS(NamedTuple):
+    """
+    BFS por níveis (Grafo.bfs_niveis). Arrays int64 indexados por vértice,
+    -1 = inalcançável / sem pai. raizes[v] é a origem que alcançou v primeiro
+    (no modo multi-origem: a "instalação" mais próxima, em saltos).
+    """
+    ordem: List[int]            # por nível; dentro do nível, por índice
+    distancias: np.ndarray
+    pais: np.ndarray
+    raizes: np.ndarray
+
+def normalizar_origens(origens: Union[int, Iterable[int]], n: int) -> np.ndarray:
+    """Uma origem ou várias -> array ordenado, sem repetição; fora do intervalo é ignorada."""
+    if isinstance(origens, (int, np.integer)):
+        origens = [origens]
+    arr = np.unique(np.fromiter((int(o) for o in origens), dtype=np.int64))
+    return arr[(arr >= 0) & (arr < n)]
+
 def busca_em_profundidade(grafo, origem: int) -> List[int]:
     """Busca em Profundidade (DFS) - retorna ordem de visitação"""
-    if origem < 0 or origem >= len(grafo.vertices):
-        return []
-    
-    visitados = [False] * len(grafo.vertices)
-    ordem_visita = []
-    
-    def dfs_recursiva(v):
-        visitados[v] = True
-        ordem_visita.append(v)
-        
-        for vizinho in grafo.retornar_vizinhos(v):
-            if not visitados[vizinho]:
-                dfs_recursiva(vizinho)
-    
-    dfs_recursiva(origem)
-    return ordem_visita
+    return dfs_iterativa(grafo, origem).ordem
 
-def dijkstra(grafo, origem: int) -> Tuple[List[float], Dict[int, List[int]]]:
+class ResultadoDFS(NamedTuple):
+    """Vetores indexados por vértice; -1 = não visitado / sem pai."""
+    ordem: List[int]        # ordem de descoberta
+    descoberta: List[int]   # tempo de descoberta
+    termino: List[int]      # tempo de término
+    pai: List[int]
+    ciclico: bool           # achou aresta de retorno (só tem sentido em direcionados)
+
+def dfs_iterativa(grafo, origem: Optional[int] = 0) -> ResultadoDFS:
     """
-    Algoritmo de Dijkstra - retorna (distancias, caminhos)
+    DFS com pilha explícita: mesma ordem de visita da versão recursiva, sem
+    limite de profundidade. Cada quadro da pilha guarda (vértice, iterador dos
+    vizinhos), então retomar um vértice continua de onde parou.
+    origem=None percorre a floresta inteira (raízes em ordem de índice).
+    Tempos vêm de um relógio único: descoberta[v] < termino[v] < 2V.
     """
-    #print(grafo.peso_aresta, 5, 3)
+    n = len(grafo.vertices)
+    descoberta = [-1] * n
+    termino = [-1] * n
+    pai = [-1] * n
+    ordem: List[int] = []
+    ciclico = False
+    if origem is None:
+        raizes = range(n)
+    elif 0 <= origem < n:
+        raizes = (int(origem),)
+    else:
+        raizes = ()
+
+    vizinhos = vizinhanca(grafo)
+    relogio = 0
+    for raiz in raizes:
+        if descoberta[raiz] != -1:
+            continue
+        descoberta[raiz] = relogio
+        relogio += 1
+        ordem.append(raiz)
+        pilha = [(raiz, iter(vizinhos(raiz)))]
+        while pilha:
+            v, restantes = pilha[-1]
+            for u in restantes:
+                if descoberta[u] == -1:
+                    u = int(u)
+                    pai[u] = v
+                    descoberta[u] = relogio
+                    relogio += 1
+                    ordem.append(u)
+                    pilha.append((u, iter(vizinhos(u))))
+                    break
+                if termino[u] == -1:
+                    ciclico = True  # u ainda está na pilha
+            else:
+                pilha.pop()
+                termino[v] = relogio
+                relogio += 1
+    return ResultadoDFS(ordem, descoberta, termino, pai, ciclico)
+
+def ordenacao_topologica(grafo) -> Optional[List[int]]:
+    """Ordem topológica (término decrescente da DFS). None se houver ciclo."""
+    r = dfs_iterativa(grafo, None)
+    if r.ciclico:
+        return None
+    por_tempo = [-1] * (2 * len(grafo.vertices))
+    for v, t in enumerate(r.termino):
+        por_tempo[t] = v
+    return [v for v in reversed(por_tempo) if v != -1]
 
-    if origem < 0 or origem >= len(grafo.vertices) or not grafo.ponderado:
-        return [], {}
-    
+def componentes_fortemente_conexas(grafo) -> List[List[int]]:
+    """
+    Tarjan iterativo (mesma pilha de quadros da dfs_iterativa).
+    Componentes saem em ordem topológica reversa: sumidouros primeiro.
+    """
     n = len(grafo.vertices)
-    distancias = [float('inf')] * n
-    predecessores = [-1] * n
-    visitados = [False] * n
-    
-    distancias[origem] = 0
-    fila_prioridade = [(0, origem)]
-    
-    while fila_prioridade:
-        dist_atual, vertice_atual = heapq.heappop(fila_prioridade)  # CORRIGIDO AQUI!
-        
-        if visitados[vertice_atual]:
+    indice = [-1] * n
+    low = [0] * n
+    na_pilha = [False] * n
+    pilha_scc: List[int] = []
+    componentes: List[List[int]] = []
+    contador = 0
+    vizinhos = vizinhanca(grafo)
+
+    for raiz in range(n):
+        if indice[raiz] != -1:
             continue
-            
-        visitados[vertice_atual] = True
-        
-        for vizinho in grafo.retornar_vizinhos(vertice_atual):
-            peso = grafo.peso_aresta(vertice_atual, vizinho)
-            if peso is None:
-                continue
-                
-            nova_distancia = dist_atual + peso
-            
-            if nova_distancia < distancias[vizinho]:
-                distancias[vizinho] = nova_distancia
-                predecessores[vizinho] = vertice_atual
-                heapq.heappush(fila_prioridade, (nova_distancia, vizinho))
-    
-    # Construir caminhos completos
-    caminhos = {}
-    for i in range(n):
-        if distancias[i] == float('inf'):
-            caminhos[i] = []
+        indice[raiz] = low[raiz] = contador
+        contador += 1
+        pilha_scc.append(raiz)
+        na_pilha[raiz] = True
+        chamadas = [(raiz, iter(vizinhos(raiz)))]
+        while chamadas:
+            v, restantes = chamadas[-1]
+            for u in restantes:
+                if indice[u] == -1:
+                    u = int(u)
+                    indice[u] = low[u] = contador
+                    contador += 1
+                    pilha_scc.append(u)
+                    na_pilha[u] = True
+                    chamadas.append((u, iter(vizinhos(u))))
+                    break
+                if na_pilha[u] and indice[u] < low[v]:
+                    low[v] = indice[u]
+            else:
+                chamadas.pop()
+                if chamadas:
+                    p = chamadas[-1][0]
+                    if low[v] < low[p]:
+                        low[p] = low[v]
+                if low[v] == indice[v]:
+                    componente = []
+                    while True:
+                        w = pilha_scc.pop()
+                        na_pilha[w] = False
+                        componente.append(w)
+                        if w == v:
+                            break
+                    componentes.append(componente)
+    return componentes
+
+def dijkstra_heap(n: int, vizinhos: Callable[[int], Iterable[Tuple[int, float]]], origem: int,
+                  perfil=None) -> Tuple[List[float], List[int]]:
+    """Dijkstra com heapq e entradas repetidas. (distâncias com inf, predecessores)."""
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    visit = [False] * n
+    dist[origem] = 0.0
+    pq: List[Tuple[float, int]] = [(0.0, origem)]
+    push, pop = heapq.heappush, heapq.heappop
+    if perfil is not None:
+        push = perfil.contando(push, "heap_push", "relaxacoes")
+        pop = perfil.contando(pop, "heap_pop")
+        perfil.contar("heap_push")
+    while pq:
+        d_atual, v = pop(pq)
+        if visit[v]:
             continue
-            
-        caminho = []
-        atual = i
-        while atual != -1:
-            caminho.append(atual)
-            atual = predecessores[atual]
-        caminhos[i] = list(reversed(caminho))
-    
-    return distancias, caminhos
\ No newline at end of file
+        visit[v] = True
+        for u, peso in vizinhos(v):
+            nd = d_atual + peso
+            if nd < dist[u]:
+                dist[u] = nd
+                pred[u] = v
+                push(pq, (nd, u))
+    return dist, pred
+
+
+def dijkstra_matriz(matriz: np.ndarray, origem: int, perfil=None) -> Tuple[List[float], List[int]]:
+    """
+    Dijkstra O(V²) sem heap (0 = sem aresta): a cada passo argmin sobre o
+    vetor de distâncias e relaxamento da linha inteira. Empates vão para o
+    menor índice, como no heap de tuplas.
+    """
+    n = matriz.shape[0]
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    fechado = np.zeros(n, dtype=bool)
+    dist[origem] = 0.0
+    for _ in range(n):
+        candidatos = np.where(fechado, np.inf, dist)
+        v = int(np.argmin(candidatos))
+        if candidatos[v] == np.inf:
+            break
+        fechado[v] = True
+        linha = matriz[v]
+        nd = dist[v] + linha
+        melhora = (linha != 0) & (nd < dist)
+        dist[melhora] = nd[melhora]
+        pred[melhora] = v
+        if perfil is not None:
+            perfil.contar("relaxacoes", int(np.count_nonzero(melhora)))
+    return dist.tolist(), pred.tolist()
+
+
+def distancias_dijkstra(grafo, origem: int) -> Tuple[List[float], List[int]]:
+    """
+    Núcleo do Dijkstra: (distâncias com inf, predecessores), ([], []) se a
+    origem for inválida ou o grafo não ponderado. Grafo com `matriz` usa
+    dijkstra_matriz; os demais, dijkstra_heap sobre o acesso do backend.
+    """
+    n = len(grafo.vertices)
+    if origem < 0 or origem >= n or not grafo.ponderado:
+        return [], []
+    perfil = getattr(grafo, "_perfil", None)
+    matriz = getattr(grafo, "matriz", None)
+    if matriz is not None:
+        return dijkstra_matriz(matriz, int(origem), perfil)
+    return dijkstra_heap(n, vizinhanca_ponderada(grafo), int(origem), perfil)
+
+
+def dijkstra(grafo, origem: int, materializar: bool = False):
+    """
+    Algoritmo de Dijkstra - retorna ResultadoDijkstra, desempacotável como
+    (distancias, caminhos); inalcançáveis ficam com float('inf')
+    (Grafo.dijkstra troca por None).
+    Caminhos são montados sob demanda; materializar=True devolve a tupla
+    antiga com o dict de todos os caminhos.
+    """
+    resultado = ResultadoDijkstra(*distancias_dijkstra(grafo, origem))
+    return resultado.como_tupla() if materializar else resultado
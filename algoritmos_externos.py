@@ -0,0 +1,134 @@
+# algoritmos_externos.py
+"""
+Algoritmos que consomem o arquivo em lotes (leitor_arquivos.ler_arestas_em_lotes)
+em vez de montar o grafo: a memória fica limitada a O(V) + O(lote), então
+funcionam para arquivos de arestas maiores que a RAM.
+
+Arestas repetidas no arquivo não são deduplicadas (ver ler_arestas_em_lotes).
+"""
+import heapq
+import os
+import tempfile
+from typing import List, Optional, Tuple
+import numpy as np
+from leitor_arquivos import ler_cabecalho, detectar_base_em_lotes, ler_arestas_em_lotes
+
+_REGISTRO_ARESTA = np.dtype([("w", np.float64), ("u", np.int64), ("v", np.int64)])
+
+
+def graus_em_lotes(caminho: str, tamanho_lote: int = 1_000_000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (grau_saida, grau_entrada) por vértice. Em grafos não-direcionados os dois
+    arrays são o mesmo grau (laço conta 1, como na lista de adjacência).
+    """
+    V, _, D, _ = ler_cabecalho(caminho)
+    saida = np.zeros(V, dtype=np.int64)
+    entrada = np.zeros(V, dtype=np.int64) if D else saida
+    for u, v, _ in ler_arestas_em_lotes(caminho, tamanho_lote):
+        saida += np.bincount(u, minlength=V)
+        if D:
+            entrada += np.bincount(v, minlength=V)
+        else:
+            saida += np.bincount(v[u != v], minlength=V)
+    return saida, entrada
+
+
+def bfs_em_lotes(caminho: str, origem: int = 0,
+                 tamanho_lote: int = 1_000_000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    BFS sincronizada por nível: cada nível é uma passada pelo arquivo.
+    Retorna (distancias, pais) em saltos; -1 para inalcançável / sem pai.
+    Custo: O(diâmetro · E) de leitura, O(V) de memória.
+    """
+    V, _, D, _ = ler_cabecalho(caminho)
+    dist = np.full(V, -1, dtype=np.int64)
+    pai = np.full(V, -1, dtype=np.int64)
+    if origem < 0 or origem >= V:
+        return dist, pai
+    base = detectar_base_em_lotes(caminho, tamanho_lote)
+    dist[origem] = 0
+    nivel = 0
+    while True:
+        avancou = False
+        for u, v, _ in ler_arestas_em_lotes(caminho, tamanho_lote, base):
+            sentidos = ((u, v),) if D else ((u, v), (v, u))
+            for a, b in sentidos:
+                m = (dist[a] == nivel) & (dist[b] == -1)
+                if not m.any():
+                    continue
+                # primeira aresta do arquivo que alcança b define o pai
+                novos, primeira = np.unique(b[m], return_index=True)
+                dist[novos] = nivel + 1
+                pai[novos] = a[m][primeira]
+                avancou = True
+        if not avancou:
+            return dist, pai
+        nivel += 1
+
+
+def _ler_corrida(arquivo: str, indice: int, tamanho_bloco: int):
+    """Itera (w, corrida, posição, u, v) de uma corrida ordenada, bloco a bloco."""
+    dados = np.load(arquivo, mmap_mode="r")
+    for ini in range(0, len(dados), tamanho_bloco):
+        bloco = dados[ini:ini + tamanho_bloco]
+        for j, (w, u, v) in enumerate(zip(bloco["w"].tolist(), bloco["u"].tolist(), bloco["v"].tolist())):
+            yield w, indice, ini + j, u, v
+
+
+def kruskal_externo(caminho: str, tamanho_lote: int = 1_000_000,
+                    diretorio: Optional[str] = None) -> Tuple[List[Tuple[int, int, float]], float]:
+    """
+    Kruskal com ordenação externa por peso:
+      1) cada lote é ordenado (estável) e gravado como corrida .npy temporária;
+      2) as corridas são intercaladas (heapq.merge) lendo blocos pequenos;
+      3) Union-Find iterativo em O(V), parando com V-1 arestas.
+    Mesmo formato de retorno de algoritmo_coloracao.kruskal.
+    """
+    V, _, _, P = ler_cabecalho(caminho)
+    if V == 0:
+        return [], 0.0
+    with tempfile.TemporaryDirectory(dir=diretorio) as tmp:
+        corridas = []
+        for u, v, w in ler_arestas_em_lotes(caminho, tamanho_lote):
+            fora_laco = u != v
+            u, v, w = u[fora_laco], v[fora_laco], w[fora_laco]
+            if P != 1:
+                w = np.ones(len(u))
+            if len(u) == 0:
+                continue
+            ordem = np.argsort(w, kind="stable")
+            registro = np.empty(len(u), dtype=_REGISTRO_ARESTA)
+            registro["w"], registro["u"], registro["v"] = w[ordem], u[ordem], v[ordem]
+            arquivo = os.path.join(tmp, f"corrida{len(corridas)}.npy")
+            np.save(arquivo, registro)
+            corridas.append(arquivo)
+            del registro
+
+        bloco = max(1, tamanho_lote // max(1, len(corridas)))
+        parent = list(range(V))
+        tamanho = [1] * V
+
+        def find(a: int) -> int:
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        mst: List[Tuple[int, int, float]] = []
+        total = 0.0
+        fontes = [_ler_corrida(arq, i, bloco) for i, arq in enumerate(corridas)]
+        for w, _, _, u, v in heapq.merge(*fontes):
+            ra, rb = find(u), find(v)
+            if ra == rb:
+                continue
+            if tamanho[ra] < tamanho[rb]:
+                ra, rb = rb, ra
+            parent[rb] = ra
+            tamanho[ra] += tamanho[rb]
+            mst.append((u, v, w))
+            total += w
+            if len(mst) == V - 1:
+                break
+        for fonte in fontes:
+            fonte.close()
+    return mst, total
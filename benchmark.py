@@ -0,0 +1,201 @@
+# benchmark.py
+"""
+Benchmark reprodutível: grafos de geradores.py (semente fixa), gravados no
+formato de entrada e lidos por ler_arquivo, e os algoritmos da biblioteca em
+GrafoLista e GrafoMatriz.
+
+Para cada (cenário, representação, algoritmo): aquecimento, N repetições
+cronometradas (mediana, p90, mín, máx) e uma execução extra sob tracemalloc
+para o pico de memória (fora da cronometragem, que o tracemalloc atrasa).
+Antes de cada execução o grafo é marcado como modificado, para que a visão
+não-direcionada em cache não passe de uma repetição para a outra.
+
+O resultado vai para JSON (padrão: benchmark.json na pasta temporária, fora
+da árvore do repositório); --comparar aponta regressões da mediana contra um
+JSON anterior (código de saída 1 se houver).
+
+    python benchmark.py [--rapido] [--repeticoes N] [--aquecimento N]
+                        [--saida arq.json] [--comparar base.json] [--tolerancia 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+import numpy as np
+import geradores
+from algoritmo_coloracao import (heuristica_dsat, heuristica_simples, heuristica_welsh_powell,
+                                 kruskal, prim)
+from leitor_arquivos import ler_arquivo
+
+
+class Cenario(NamedTuple):
+    nome: str
+    gerador: str
+    parametros: tuple
+    semente: int = 0
+    direcionado: bool = False
+
+
+CENARIOS = [
+    Cenario("erdos_renyi_1000", "erdos_renyi", (1000, 0.01)),
+    Cenario("geometrico_1000", "geometrico", (1000, 0.06)),
+    Cenario("grade_32x32", "grade", (32, 32)),
+    Cenario("completo_150", "completo", (150,)),
+    Cenario("lei_de_potencia_1000", "lei_de_potencia", (1000, 3)),
+    Cenario("erdos_renyi_dir_1000", "erdos_renyi", (1000, 0.01), direcionado=True),
+]
+
+CENARIOS_RAPIDOS = [
+    Cenario("erdos_renyi_200", "erdos_renyi", (200, 0.03)),
+    Cenario("geometrico_200", "geometrico", (200, 0.12)),
+    Cenario("grade_10x10", "grade", (10, 10)),
+    Cenario("completo_40", "completo", (40,)),
+    Cenario("lei_de_potencia_200", "lei_de_potencia", (200, 3)),
+]
+
+ALGORITMOS: Dict[str, Callable] = {
+    "bfs": lambda g: g.bfs(0),
+    "dfs": lambda g: g.dfs(0),
+    "dijkstra": lambda g: g.dijkstra(0),
+    "welsh_powell": heuristica_welsh_powell,
+    "dsatur": heuristica_dsat,
+    "heuristica_simples": heuristica_simples,
+    "prim": prim,
+    "kruskal": kruskal,
+}
+
+REPRESENTACOES = ("lista", "matriz")
+
+
+def medir(funcao: Callable[[], object], repeticoes: int = 5, aquecimento: int = 1,
+          antes: Callable[[], None] = lambda: None) -> Dict[str, float]:
+    """Tempos (s) de `repeticoes` chamadas após `aquecimento`, e pico de memória (bytes)."""
+    for _ in range(aquecimento):
+        antes()
+        funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        antes()
+        ini = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - ini)
+    antes()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    t = np.array(tempos)
+    return {
+        "mediana": float(np.median(t)),
+        "p90": float(np.percentile(t, 90)),
+        "min": float(t.min()),
+        "max": float(t.max()),
+        "repeticoes": repeticoes,
+        "pico_memoria": int(pico),
+    }
+
+
+def _metadados() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def executar(cenarios: List[Cenario], algoritmos: List[str], repeticoes: int = 5,
+             aquecimento: int = 1, verbose: bool = True) -> Dict[str, object]:
+    """Roda a matriz cenário × representação × algoritmo; devolve o dicionário do JSON."""
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta:
+        for c in cenarios:
+            gerado = geradores.GERADORES[c.gerador](*c.parametros, semente=c.semente,
+                                                    direcionado=c.direcionado)
+            caminho = os.path.join(pasta, c.nome + ".txt")
+            geradores.escrever(gerado, caminho)
+            for rep in REPRESENTACOES:
+                grafo, carga = ler_arquivo(caminho, rep, usar_cache=False, estatisticas=True)
+                linha = {"cenario": c.nome, "representacao": rep, "V": gerado.n,
+                         "A": gerado.arestas, "direcionado": c.direcionado}
+                resultados.append(dict(linha, algoritmo="carga",
+                                       **medir(lambda: ler_arquivo(caminho, rep, usar_cache=False),
+                                               repeticoes, aquecimento),
+                                       fases=carga.tempos))
+                for nome in algoritmos:
+                    funcao = ALGORITMOS[nome]
+                    resultados.append(dict(linha, algoritmo=nome,
+                                           **medir(lambda: funcao(grafo), repeticoes, aquecimento,
+                                                   antes=grafo._modificado)))
+                if verbose:
+                    for r in resultados[-len(algoritmos) - 1:]:
+                        print(f"{r['cenario']:<22} {r['representacao']:<6} {r['algoritmo']:<19} "
+                              f"mediana {r['mediana'] * 1000:9.3f} ms | p90 {r['p90'] * 1000:9.3f} ms "
+                              f"| pico {r['pico_memoria'] / 1024:9.1f} KiB")
+    return {"metadados": _metadados(), "resultados": resultados}
+
+
+def comparar(base: Dict[str, object], atual: Dict[str, object],
+             tolerancia: float = 0.2) -> List[Dict[str, object]]:
+    """Entradas cuja mediana piorou mais que `tolerancia` (fração) em relação à base."""
+    def chave(r):
+        return r["cenario"], r["representacao"], r["algoritmo"]
+    anteriores = {chave(r): r for r in base["resultados"]}
+    regressoes = []
+    for r in atual["resultados"]:
+        antes = anteriores.get(chave(r))
+        if antes is None or antes["mediana"] <= 0:
+            continue
+        razao = r["mediana"] / antes["mediana"]
+        if razao > 1 + tolerancia:
+            regressoes.append({"cenario": r["cenario"], "representacao": r["representacao"],
+                               "algoritmo": r["algoritmo"], "antes": antes["mediana"],
+                               "depois": r["mediana"], "razao": razao})
+    return regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de grafos.")
+    parser.add_argument("--rapido", action="store_true", help="cenários pequenos")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--aquecimento", type=int, default=1)
+    parser.add_argument("--algoritmos", nargs="+", choices=list(ALGORITMOS), default=list(ALGORITMOS))
+    parser.add_argument("--saida", default=os.path.join(tempfile.gettempdir(), "benchmark.json"),
+                        help="JSON de saída (padrão: benchmark.json na pasta temporária)")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="piora relativa da mediana tolerada (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    relatorio = executar(CENARIOS_RAPIDOS if args.rapido else CENARIOS, args.algoritmos,
+                         args.repeticoes, args.aquecimento)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regressoes = comparar(base, relatorio, args.tolerancia)
+        for r in regressoes:
+            print(f"⚠️ {r['cenario']} {r['representacao']} {r['algoritmo']}: "
+                  f"{r['antes'] * 1000:.3f} → {r['depois'] * 1000:.3f} ms ({r['razao']:.2f}x)")
+        if regressoes:
+            sys.exit(1)
+        print(f"✅ Sem regressões acima de {args.tolerancia:.0%} (base {base['metadados'].get('commit')})")
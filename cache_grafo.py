@@ -0,0 +1,139 @@
+# cache_grafo.py
+"""
+Snapshot binário de um arquivo de grafo já normalizado (CSR).
+
+O arquivo "<fonte>.grafobin" fica ao lado do .txt e guarda:
+  - cabeçalho fixo: V, A, D, P, base detectada, contagens da leitura e a
+    identificação da fonte (mtime, tamanho, blake2b);
+  - indptr (int64), indices (int32/int64) e pesos (float64, só se P=1),
+    cada um alinhado em 64 bytes para ser mapeado direto com np.memmap.
+
+Validade: mtime+tamanho iguais => usa sem ler a fonte. Se mudaram, compara
+o hash do conteúdo; igual => só atualiza o mtime gravado, diferente => descarta.
+"""
+import hashlib
+import os
+import struct
+from typing import NamedTuple, Optional
+import numpy as np
+
+EXTENSAO = ".grafobin"
+MAGICO = b"GRAFOBIN"
+VERSAO = 1
+ALINHAMENTO = 64
+
+# magico, versao, V, A, D, P, base, largura dos índices,
+# lidas, rejeitadas, m (entradas em indices), mtime_ns, tamanho, hash
+_CABECALHO = struct.Struct("<8sI4xqqbbbb4xqqqqq32s")
+
+
+class Snapshot(NamedTuple):
+    V: int
+    A: int
+    D: int
+    P: int
+    base: int
+    lidas: int
+    rejeitadas: int
+    indptr: np.ndarray
+    indices: np.ndarray
+    pesos: Optional[np.ndarray]
+
+
+def caminho_cache(caminho: str) -> str:
+    return caminho + EXTENSAO
+
+
+def hash_arquivo(caminho: str) -> bytes:
+    h = hashlib.blake2b(digest_size=32)
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.digest()
+
+
+def _alinhar(pos: int) -> int:
+    return (pos + ALINHAMENTO - 1) // ALINHAMENTO * ALINHAMENTO
+
+
+def _layout(V: int, m: int, largura: int, ponderado: bool):
+    """Offsets de indptr, indices e pesos dentro do arquivo."""
+    off_indptr = _alinhar(_CABECALHO.size)
+    off_indices = _alinhar(off_indptr + 8 * (V + 1))
+    off_pesos = _alinhar(off_indices + largura * m)
+    fim = off_pesos + (8 * m if ponderado else 0)
+    return off_indptr, off_indices, off_pesos, fim
+
+
+def salvar_cache(caminho: str, V: int, A: int, D: int, P: int, base: int,
+                 lidas: int, rejeitadas: int, indptr, indices, pesos=None) -> bool:
+    """Grava o snapshot de `caminho` (pesos obrigatórios se P=1).
+    Falhas de escrita são ignoradas (retorna False)."""
+    try:
+        st = os.stat(caminho)
+        digest = hash_arquivo(caminho)
+        indptr = np.ascontiguousarray(indptr, dtype=np.int64)
+        indices = np.ascontiguousarray(indices)
+        largura = indices.dtype.itemsize
+        m = len(indices)
+        ponderado = P == 1
+        off_indptr, off_indices, off_pesos, _ = _layout(V, m, largura, ponderado)
+
+        destino = caminho_cache(caminho)
+        temporario = f"{destino}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(_CABECALHO.pack(MAGICO, VERSAO, V, A, D, P, base, largura,
+                                    lidas, rejeitadas, m, st.st_mtime_ns, st.st_size, digest))
+            for offset, arr in ((off_indptr, indptr), (off_indices, indices)):
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(arr.tobytes())
+            if ponderado:
+                f.write(b"\0" * (off_pesos - f.tell()))
+                f.write(np.ascontiguousarray(pesos, dtype=np.float64).tobytes())
+        os.replace(temporario, destino)
+        return True
+    except OSError:
+        return False
+
+
+def carregar_cache(caminho: str) -> Optional[Snapshot]:
+    """Snapshot válido para `caminho` (arrays em np.memmap, sem cópia) ou None."""
+    destino = caminho_cache(caminho)
+    try:
+        st = os.stat(caminho)
+        with open(destino, "rb") as f:
+            bruto = f.read(_CABECALHO.size)
+        tamanho_cache = os.path.getsize(destino)
+    except OSError:
+        return None
+    if len(bruto) != _CABECALHO.size:
+        return None
+
+    (magico, versao, V, A, D, P, base, largura,
+     lidas, rejeitadas, m, mtime_ns, tamanho, digest) = _CABECALHO.unpack(bruto)
+    if magico != MAGICO or versao != VERSAO or largura not in (4, 8):
+        return None
+    off_indptr, off_indices, off_pesos, fim = _layout(V, m, largura, P == 1)
+    if tamanho_cache < fim:
+        return None
+
+    if st.st_mtime_ns != mtime_ns or st.st_size != tamanho:
+        if st.st_size != tamanho or hash_arquivo(caminho) != digest:
+            return None
+        # Conteúdo igual, só o mtime mudou (checkout, cópia...): revalida
+        try:
+            with open(destino, "r+b") as f:
+                f.write(_CABECALHO.pack(MAGICO, VERSAO, V, A, D, P, base, largura,
+                                        lidas, rejeitadas, m, st.st_mtime_ns, st.st_size, digest))
+        except OSError:
+            pass
+
+    indptr = np.memmap(destino, dtype=np.int64, mode="r", offset=off_indptr, shape=(V + 1,))
+    dtype = np.int32 if largura == 4 else np.int64
+    indices = (np.memmap(destino, dtype=dtype, mode="r", offset=off_indices, shape=(m,))
+               if m else np.empty(0, dtype=dtype))
+    pesos = None
+    if P == 1:
+        pesos = (np.memmap(destino, dtype=np.float64, mode="r", offset=off_pesos, shape=(m,))
+                 if m else np.empty(0, dtype=np.float64))
+    return Snapshot(V, A, D, P, base, lidas, rejeitadas, indptr, indices, pesos)
@@ -0,0 +1,105 @@
+# cache_resultados.py
+"""
+Cache LRU de resultados de algoritmos por grafo (Grafo.ativar_cache).
+
+Chave: (algoritmo, origem). O cache guarda a versão do grafo (Grafo.versao,
+que inserir/remover vértice/aresta incrementam) e se esvazia sozinho na
+primeira consulta depois de uma alteração. O limite é em bytes estimados
+(sys.getsizeof dos contêineres e dos elementos); passando do
+limite, saem as entradas usadas há mais tempo.
+
+Resultados vindos do cache são os mesmos objetos a cada acerto: não modificar.
+"""
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Set
+
+LIMITE_PADRAO = 64 * 1024 * 1024
+
+
+class EstatisticasCache(NamedTuple):
+    acertos: int
+    falhas: int
+    despejos: int          # entradas tiradas para caber no limite
+    invalidacoes: int      # esvaziamentos por mudança de versão
+    entradas: int
+    bytes_usados: int
+    limite_bytes: int
+
+    @property
+    def taxa_acerto(self) -> float:
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+
+def tamanho_estimado(obj: Any, _vistos: Optional[Set[int]] = None) -> int:
+    """Bytes aproximados de um resultado (listas, tuplas, dicts, arrays, objetos
+    com __dict__); contêineres compartilhados contam uma vez só."""
+    if _vistos is None:
+        _vistos = set()
+    if id(obj) in _vistos:
+        return 0
+    tamanho = sys.getsizeof(obj)  # ndarray dono dos dados já inclui nbytes
+    if isinstance(obj, (list, tuple)):
+        _vistos.add(id(obj))
+        tamanho += sum(tamanho_estimado(x, _vistos) for x in obj)
+    elif isinstance(obj, dict):
+        _vistos.add(id(obj))
+        tamanho += sum(tamanho_estimado(k, _vistos) + tamanho_estimado(v, _vistos)
+                       for k, v in obj.items())
+    elif hasattr(obj, "__dict__"):
+        _vistos.add(id(obj))
+        tamanho += sum(tamanho_estimado(v, _vistos) for v in vars(obj).values())
+    return tamanho
+
+
+class CacheResultados:
+    """LRU limitado em bytes, invalidado pela versão do grafo."""
+
+    def __init__(self, limite_bytes: int = LIMITE_PADRAO):
+        if limite_bytes <= 0:
+            raise ValueError("limite_bytes deve ser positivo")
+        self.limite_bytes = limite_bytes
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()  # chave -> (resultado, bytes)
+        self._versao = None
+        self._bytes = 0
+        self._acertos = self._falhas = self._despejos = self._invalidacoes = 0
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obter(self, versao: int, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Resultado em cache para `chave`, ou calcular() (guardado se couber)."""
+        if versao != self._versao:
+            if self._entradas:
+                self._invalidacoes += 1
+            self._esvaziar()
+            self._versao = versao
+        entrada = self._entradas.get(chave)
+        if entrada is not None:
+            self._entradas.move_to_end(chave)
+            self._acertos += 1
+            return entrada[0]
+        self._falhas += 1
+        resultado = calcular()
+        tamanho = tamanho_estimado(resultado)
+        if tamanho <= self.limite_bytes:
+            while self._bytes + tamanho > self.limite_bytes:
+                _, (_, liberado) = self._entradas.popitem(last=False)
+                self._bytes -= liberado
+                self._despejos += 1
+            self._entradas[chave] = (resultado, tamanho)
+            self._bytes += tamanho
+        return resultado
+
+    def _esvaziar(self) -> None:
+        self._entradas.clear()
+        self._bytes = 0
+
+    def limpar(self) -> None:
+        """Esvazia o cache (estatísticas continuam)."""
+        self._esvaziar()
+
+    def estatisticas(self) -> EstatisticasCache:
+        return EstatisticasCache(self._acertos, self._falhas, self._despejos, self._invalidacoes,
+                                 len(self._entradas), self._bytes, self.limite_bytes)
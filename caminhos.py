@@ -0,0 +1,105 @@
+# caminhos.py
+import operator
+import math
+from typing import Callable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+
+class Caminhos(Mapping[int, List[int]]):
+    """
+    Mapping vértice → caminho a partir da origem, montado sob demanda
+    seguindo `predecessores`. Nada é alocado até alguém pedir um caminho.
+    Inalcançável (distância None/inf) vira [].
+    """
+
+    def __init__(self, distancias: Sequence[Optional[float]], predecessores: Sequence[int]):
+        self._dist = distancias
+        self._pred = predecessores
+
+    def __getitem__(self, v: int) -> List[int]:
+        try:
+            v = operator.index(v)
+        except TypeError:
+            raise KeyError(v)
+        if v < 0 or v >= len(self._dist):
+            raise KeyError(v)
+        d = self._dist[v]
+        if d is None or d == float('inf'):
+            return []
+        caminho = []
+        while v != -1:
+            caminho.append(v)
+            v = self._pred[v]
+        caminho.reverse()
+        return caminho
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._dist)))
+
+    def __len__(self) -> int:
+        return len(self._dist)
+
+
+class ResultadoDijkstra:
+    """
+    Resultado de dijkstra: distâncias + predecessores, caminhos sob demanda.
+
+    Continua desempacotável como a tupla antiga:
+        distancias, caminhos = grafo.dijkstra(0)
+        caminhos.get(5, [])
+    """
+
+    def __init__(self, distancias: List[Optional[float]], predecessores: List[int]):
+        self.distancias = distancias
+        self.predecessores = predecessores
+        self.caminhos = Caminhos(distancias, predecessores)
+
+    def caminho_ate(self, v: int) -> List[int]:
+        """Caminho origem → v ([] se inalcançável ou fora do intervalo)."""
+        return self.caminhos.get(v, [])
+
+    path_to = caminho_ate
+
+    def como_tupla(self):
+        """(distancias, {v: caminho}) com todos os caminhos materializados."""
+        return self.distancias, dict(self.caminhos.items())
+
+    # Compatibilidade com o retorno antigo (distancias, caminhos)
+    def __iter__(self):
+        return iter((self.distancias, self.caminhos))
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, i: int):
+        return (self.distancias, self.caminhos)[i]
+
+    def __repr__(self) -> str:
+        return f"ResultadoDijkstra(vertices={len(self.distancias)})"
+
+
+class ResultadoCaminho(NamedTuple):
+    """Consulta ponto a ponto: distância (None se inalcançável), caminho e
+    quantos vértices foram assentados (fechados) até parar."""
+    distancia: Optional[float]
+    caminho: List[int]
+    assentados: int
+
+
+def heuristica_grande_circulo(coordenadas: Sequence[Tuple[float, float]], destino: int,
+                              raio: float = 6371.0, escala: float = 1.0) -> Callable[[int], float]:
+    """
+    Heurística para A*: distância de grande círculo (haversine) de cada
+    vértice até `destino`, com coordenadas (lat, lon) em graus. Só é
+    admissível se todo peso de aresta for >= escala * distância geodésica
+    entre as pontas (ex.: pesos em km e escala=1).
+    """
+    lat2, lon2 = map(math.radians, coordenadas[destino])
+    cos_lat2 = math.cos(lat2)
+
+    def h(v: int) -> float:
+        lat1, lon1 = map(math.radians, coordenadas[v])
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * cos_lat2 * math.sin((lon2 - lon1) / 2) ** 2)
+        return escala * 2 * raio * math.asin(min(1.0, math.sqrt(a)))
+
+    return h
@@ -0,0 +1,209 @@
+# dijkstra_paralelo.py
+"""
+Dijkstra a partir de várias (ou todas as) origens, distribuído em um
+ProcessPoolExecutor.
+
+O grafo é congelado em CSR (Grafo.freeze) e os arrays indptr/indices/pesos
+vão para blocos de multiprocessing.shared_memory: os workers só recebem os
+nomes dos blocos e montam views NumPy, sem pickle do grafo. No modo matriz
+cada worker escreve sua linha direto em uma matriz de saída também
+compartilhada; no modo streaming as linhas voltam por pickle, uma por origem.
+
+Grafos não ponderados usam peso 1 (distância em saltos).
+"""
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from algoritmos import dijkstra_heap, vizinhanca_ponderada_csr
+
+# Estado de cada worker (preenchido por _iniciar_worker)
+_GRAFO: Dict[str, np.ndarray] = {}
+_BLOCOS: List[shared_memory.SharedMemory] = []
+
+
+def dijkstra_csr(indptr: np.ndarray, indices: np.ndarray, pesos: Optional[np.ndarray],
+                 origem: int) -> np.ndarray:
+    """
+    Dijkstra com heap (algoritmos.dijkstra_heap) lendo as fatias dos arrays
+    CSR direto, sem copiar o grafo. Retorna distâncias (inf = inalcançável).
+    """
+    vizinhos = vizinhanca_ponderada_csr(indptr, indices, pesos)
+    dist, _ = dijkstra_heap(len(indptr) - 1, vizinhos, int(origem))
+    return np.array(dist, dtype=np.float64)
+
+
+# --- Memória compartilhada ---
+def _compartilhar(arrays: Dict[str, np.ndarray]):
+    """Copia cada array para um bloco novo. Retorna (blocos, descritores, views)."""
+    blocos, descritores, views = [], {}, {}
+    for nome, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        bloco = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+        views[nome] = np.ndarray(arr.shape, dtype=arr.dtype, buffer=bloco.buf)
+        views[nome][...] = arr
+        blocos.append(bloco)
+        descritores[nome] = (bloco.name, arr.shape, arr.dtype.str)
+    return blocos, descritores, views
+
+
+def _anexar(descritores) -> Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]:
+    blocos, arrays = [], {}
+    for nome, (bloco_nome, forma, dtype) in descritores.items():
+        bloco = shared_memory.SharedMemory(name=bloco_nome)
+        blocos.append(bloco)
+        arrays[nome] = np.ndarray(forma, dtype=np.dtype(dtype), buffer=bloco.buf)
+    return blocos, arrays
+
+
+def _iniciar_worker(descritores) -> None:
+    blocos, arrays = _anexar(descritores)
+    _BLOCOS.extend(blocos)
+    _GRAFO.update(arrays)
+
+
+def _tarefa_matriz(linhas: Sequence[int], origens: Sequence[int]) -> int:
+    g = _GRAFO
+    for linha, origem in zip(linhas, origens):
+        g["saida"][linha] = dijkstra_csr(g["indptr"], g["indices"], g.get("pesos"), origem)
+    return len(linhas)
+
+
+def _tarefa_streaming(origens: Sequence[int]) -> List[Tuple[int, np.ndarray]]:
+    g = _GRAFO
+    return [(o, dijkstra_csr(g["indptr"], g["indices"], g.get("pesos"), o)) for o in origens]
+
+
+def _preparar(grafo, origens):
+    csr = grafo.freeze()
+    n = len(csr.vertices)
+    origens = list(range(n)) if origens is None else [int(o) for o in origens]
+    for o in origens:
+        if o < 0 or o >= n:
+            raise IndexError(f"Origem {o} fora do intervalo")
+    arrays = {"indptr": csr.indptr, "indices": csr.indices}
+    if csr.ponderado and csr.pesos is not None:
+        arrays["pesos"] = csr.pesos
+    return n, origens, arrays
+
+
+def _lotes(k: int, processos: int, tamanho_lote: Optional[int]) -> List[range]:
+    if tamanho_lote is None:
+        # ~4 lotes por processo: equilibra carga sem muitas idas e vindas
+        tamanho_lote = max(1, math.ceil(k / (4 * processos)))
+    return [range(i, min(k, i + tamanho_lote)) for i in range(0, k, tamanho_lote)]
+
+
+def dijkstra_multiplas_origens(grafo, origens: Optional[Sequence[int]] = None,
+                               processos: Optional[int] = None,
+                               tamanho_lote: Optional[int] = None) -> np.ndarray:
+    """
+    Matriz densa len(origens) × V de distâncias (np.inf = inalcançável).
+    origens=None => todas (all-pairs). processos=1 roda no próprio processo.
+    """
+    n, origens, arrays = _preparar(grafo, origens)
+    k = len(origens)
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or k <= 1:
+        saida = np.empty((k, n), dtype=np.float64)
+        for i, o in enumerate(origens):
+            saida[i] = dijkstra_csr(arrays["indptr"], arrays["indices"], arrays.get("pesos"), o)
+        return saida
+
+    arrays["saida"] = np.empty((k, n), dtype=np.float64)
+    blocos, descritores, views = _compartilhar(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_worker,
+                                 initargs=(descritores,)) as executor:
+            futuros = [executor.submit(_tarefa_matriz, list(lote), [origens[i] for i in lote])
+                       for lote in _lotes(k, processos, tamanho_lote)]
+            for f in as_completed(futuros):
+                f.result()
+        return np.array(views["saida"])
+    finally:
+        views.clear()
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+
+def iterar_dijkstra_multiplas_origens(grafo, origens: Optional[Sequence[int]] = None,
+                                      processos: Optional[int] = None,
+                                      tamanho_lote: Optional[int] = None
+                                      ) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Versão streaming: gera (origem, distancias) conforme os lotes terminam
+    (ordem não garantida). Memória do chamador: uma linha por vez.
+    """
+    n, origens, arrays = _preparar(grafo, origens)
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(origens) <= 1:
+        for o in origens:
+            yield o, dijkstra_csr(arrays["indptr"], arrays["indices"], arrays.get("pesos"), o)
+        return
+
+    blocos, descritores, views = _compartilhar(arrays)
+    del views
+    try:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_worker,
+                                 initargs=(descritores,)) as executor:
+            futuros = [executor.submit(_tarefa_streaming, [origens[i] for i in lote])
+                       for lote in _lotes(len(origens), processos, tamanho_lote)]
+            for f in as_completed(futuros):
+                yield from f.result()
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+
+if __name__ == "__main__":
+    # Conferência: GrafoCSR (e GrafoLista) passam pelos dois modos, no próprio
+    # processo e com workers, e batem com Grafo.dijkstra origem a origem
+    import geradores
+    from grafo_csr import GrafoCSR
+    from grafo_lista import GrafoLista
+
+    for direcionado in (False, True):
+        lista = geradores.construir(geradores.erdos_renyi(300, 0.02, semente=5,
+                                                          direcionado=direcionado), GrafoLista)
+        ponderado = lista.freeze()
+        saltos = GrafoCSR.de_csr(direcionado, False, ponderado.indptr, ponderado.indices)
+        teste = list(range(0, 300, 7))
+        for grafo, esperado in (
+                (ponderado, [[math.inf if d is None else d for d in ponderado.dijkstra(o).distancias]
+                             for o in teste]),
+                (saltos, [[math.inf if d < 0 else d for d in saltos.bfs_niveis(o).distancias.tolist()]
+                          for o in teste]),
+                (lista, None)):
+            if esperado is None:  # lista: mesmo resultado do seu CSR
+                esperado = dijkstra_multiplas_origens(ponderado, teste, processos=1)
+            for p in (1, 2):
+                assert np.array_equal(dijkstra_multiplas_origens(grafo, teste, processos=p), esperado)
+                linhas = dict(iterar_dijkstra_multiplas_origens(grafo, teste, processos=p, tamanho_lote=5))
+                assert np.array_equal([linhas[o] for o in teste], esperado)
+    print("✅ CSR e lista iguais a Grafo.dijkstra/bfs_niveis, com 1 e 2 processos.")
+
+    # Benchmark: grafo aleatório esparso, mesmas origens com 1..N processos
+    rng = np.random.default_rng(42)
+    V, E, K = 20_000, 200_000, 64
+    grafo = GrafoCSR.de_arestas(False, True, V, rng.integers(0, V, E), rng.integers(0, V, E),
+                                rng.random(E) + 0.01)
+    origens = rng.choice(V, K, replace=False)
+    print(f"V={V}, E={E}, origens={K}, núcleos={os.cpu_count()}")
+
+    referencia = None
+    base = None
+    p = 1
+    while p <= (os.cpu_count() or 1):
+        ini = time.perf_counter()
+        d = dijkstra_multiplas_origens(grafo, origens, processos=p)
+        tempo = time.perf_counter() - ini
+        if referencia is None:
+            referencia, base = d, tempo
+        assert np.array_equal(d, referencia)
+        print(f"processos={p:>3} | {tempo:7.3f}s | speedup {base / tempo:5.2f}x")
+        p *= 2
@@ -0,0 +1,182 @@
+# geradores.py
+"""
+Geradores de grafos sintéticos com semente, no formato dos arquivos de
+entrada (linha "V A D P" e uma aresta "origem destino [peso]" por linha).
+
+Cada gerador devolve um GrafoGerado com as arestas em arrays; escrever()
+grava o arquivo e construir() monta GrafoLista/GrafoMatriz direto dos arrays.
+Não há laços nem arestas repetidas. Em grafos direcionados cada aresta ganha
+um sentido sorteado (o completo direcionado tem os dois sentidos).
+"""
+from typing import NamedTuple, Optional
+import numpy as np
+
+
+class GrafoGerado(NamedTuple):
+    n: int
+    direcionado: bool
+    ponderado: bool
+    origens: np.ndarray
+    destinos: np.ndarray
+    pesos: Optional[np.ndarray]   # None quando não ponderado
+
+    @property
+    def arestas(self) -> int:
+        return len(self.origens)
+
+
+def _montar(rng, n, u, v, direcionado, ponderado, pesos=None) -> GrafoGerado:
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    if direcionado:
+        troca = rng.random(len(u)) < 0.5
+        u, v = np.where(troca, v, u), np.where(troca, u, v)
+    if not ponderado:
+        pesos = None
+    elif pesos is None:
+        pesos = rng.integers(1, 101, len(u)).astype(np.float64)
+    return GrafoGerado(n, direcionado, ponderado, u, v, pesos)
+
+
+def _pares_unicos(u: np.ndarray, v: np.ndarray, n: int):
+    """Tira laços e pares repetidos ({a, b} == {b, a}), mantendo a 1ª ocorrência."""
+    a, b = np.minimum(u, v), np.maximum(u, v)
+    chave = a * n + b
+    _, primeiros = np.unique(chave, return_index=True)
+    primeiros.sort()
+    primeiros = primeiros[a[primeiros] != b[primeiros]]
+    return a[primeiros], b[primeiros]
+
+
+def erdos_renyi(n: int, p: float, semente: int = 0, direcionado: bool = False,
+                ponderado: bool = True) -> GrafoGerado:
+    """G(n, p): cada par {a, b} entra com probabilidade p (sorteia m ~ Bin e amostra m pares)."""
+    rng = np.random.default_rng(semente)
+    total = n * (n - 1) // 2
+    m = int(rng.binomial(total, p)) if total else 0
+    a = b = np.empty(0, dtype=np.int64)
+    while len(a) < m:
+        falta = m - len(a)
+        u = rng.integers(0, n, 2 * falta + 16)
+        v = rng.integers(0, n, 2 * falta + 16)
+        a, b = _pares_unicos(np.concatenate([a, u]), np.concatenate([b, v]), n)
+    return _montar(rng, n, a[:m], b[:m], direcionado, ponderado)
+
+
+def geometrico(n: int, raio: float, semente: int = 0, direcionado: bool = False,
+               ponderado: bool = True) -> GrafoGerado:
+    """
+    Geométrico aleatório: n pontos no quadrado unitário, aresta entre pontos a
+    distância <= raio. Peso = distância × 100 (2 casas).
+    """
+    rng = np.random.default_rng(semente)
+    pontos = rng.random((n, 2))
+    us, vs, ds = [], [], []
+    bloco = max(1, 1_000_000 // max(n, 1))   # limita a matriz de distâncias por vez
+    for ini in range(0, n, bloco):
+        fim = min(n, ini + bloco)
+        d = np.sqrt(((pontos[ini:fim, None, :] - pontos[None, :, :]) ** 2).sum(axis=2))
+        linhas, colunas = np.nonzero(d <= raio)
+        linhas = linhas + ini
+        acima = colunas > linhas
+        us.append(linhas[acima])
+        vs.append(colunas[acima])
+        ds.append(d[linhas[acima] - ini, colunas[acima]])
+    u = np.concatenate(us) if us else np.empty(0, dtype=np.int64)
+    v = np.concatenate(vs) if vs else np.empty(0, dtype=np.int64)
+    pesos = np.round(np.concatenate(ds) * 100, 2) if ds else np.empty(0)
+    return _montar(rng, n, u, v, direcionado, ponderado, np.maximum(pesos, 0.01))
+
+
+def grade(linhas: int, colunas: int, semente: int = 0, direcionado: bool = False,
+          ponderado: bool = True) -> GrafoGerado:
+    """Grade linhas × colunas com vizinhança 4 (vértice = i * colunas + j)."""
+    rng = np.random.default_rng(semente)
+    ids = np.arange(linhas * colunas).reshape(linhas, colunas)
+    u = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    v = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    return _montar(rng, linhas * colunas, u, v, direcionado, ponderado)
+
+
+def completo(n: int, semente: int = 0, direcionado: bool = False,
+             ponderado: bool = True) -> GrafoGerado:
+    """K_n; direcionado tem os dois sentidos de cada par."""
+    rng = np.random.default_rng(semente)
+    if direcionado:
+        u, v = np.nonzero(~np.eye(n, dtype=bool))
+        pesos = rng.integers(1, 101, len(u)).astype(np.float64) if ponderado else None
+        return GrafoGerado(n, True, ponderado, u.astype(np.int64), v.astype(np.int64), pesos)
+    u, v = np.triu_indices(n, 1)
+    return _montar(rng, n, u, v, False, ponderado)
+
+
+def lei_de_potencia(n: int, m: int = 3, semente: int = 0, direcionado: bool = False,
+                    ponderado: bool = True) -> GrafoGerado:
+    """
+    Barabási–Albert: cada vértice novo liga-se a m vértices já existentes,
+    escolhidos com probabilidade proporcional ao grau (graus em lei de potência).
+    """
+    rng = np.random.default_rng(semente)
+    m = max(1, min(m, n - 1)) if n > 1 else 0
+    u, v = [], []
+    repetidos = list(range(m))   # cada vértice aparece aqui uma vez por grau (+ o núcleo)
+    for novo in range(m, n):
+        alvos = set()
+        while len(alvos) < m:
+            alvos.add(repetidos[int(rng.integers(len(repetidos)))])
+        for alvo in alvos:
+            u.append(novo)
+            v.append(alvo)
+        repetidos.extend(alvos)
+        repetidos.extend([novo] * m)
+    return _montar(rng, n, u, v, direcionado, ponderado)
+
+
+GERADORES = {
+    "erdos_renyi": erdos_renyi,
+    "geometrico": geometrico,
+    "grade": grade,
+    "completo": completo,
+    "lei_de_potencia": lei_de_potencia,
+}
+
+
+def escrever(gerado: GrafoGerado, caminho: str) -> None:
+    """Grava no formato de entrada de leitor_arquivos."""
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(f"{gerado.n} {gerado.arestas} {int(gerado.direcionado)} {int(gerado.ponderado)}\n")
+        if gerado.pesos is None:
+            linhas = (f"{a} {b}\n" for a, b in zip(gerado.origens.tolist(), gerado.destinos.tolist()))
+        else:
+            linhas = (f"{a} {b} {w:g}\n" for a, b, w in
+                      zip(gerado.origens.tolist(), gerado.destinos.tolist(), gerado.pesos.tolist()))
+        f.writelines(linhas)
+
+
+def construir(gerado: GrafoGerado, classe):
+    """GrafoLista/GrafoMatriz/GrafoCSR montado direto dos arrays."""
+    return classe.de_arestas(gerado.direcionado, gerado.ponderado, gerado.n,
+                             gerado.origens, gerado.destinos, gerado.pesos)
+
+
+if __name__ == "__main__":
+    # python geradores.py <gerador> <saida.txt> [parametros...] [--semente S] [--direcionado] [--sem-peso]
+    import sys
+
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in GERADORES:
+        print(f"uso: python geradores.py {{{'|'.join(GERADORES)}}} saida.txt [parametros...] "
+              "[--semente S] [--direcionado] [--sem-peso]")
+        sys.exit(1)
+    nome, saida = args[0], args[1]
+    direcionado = "--direcionado" in args
+    ponderado = "--sem-peso" not in args
+    semente = int(args[args.index("--semente") + 1]) if "--semente" in args else 0
+    numeros = []
+    for a in args[2:]:
+        if a.startswith("--"):
+            break
+        numeros.append(float(a) if "." in a else int(a))
+    gerado = GERADORES[nome](*numeros, semente=semente, direcionado=direcionado, ponderado=ponderado)
+    escrever(gerado, saida)
+    print(f"{saida}: V={gerado.n}, A={gerado.arestas}")
@@ -1,17 +1,39 @@
-from typing import List, Optional, Tuple, Dict
-from collections import deque
+from typing import Callable, Iterable, List, Optional, Tuple, Dict, Union
 import heapq
+import numpy as np
+from cache_resultados import LIMITE_PADRAO, CacheResultados, EstatisticasCache
+from caminhos import ResultadoCaminho, ResultadoDijkstra
+from instrumentacao import fase, instrumentado
+from algoritmos import (AdjacenciaCompacta, ResultadoBFS, ResultadoDFS, adjacencia_compacta,
+                        busca_em_largura, componentes_fortemente_conexas, dfs_iterativa,
+                        distancias_dijkstra, normalizar_origens, ordenacao_topologica,
+                        vizinhanca, vizinhanca_ponderada)
 
 class Grafo:
+    # Perfil de instrumentacao.instrumentar() enquanto ativo
+    _perfil = None
+
     def __init__(self, direcionado: bool, ponderado: bool):
         self.direcionado = direcionado
         self.ponderado = ponderado
         self.vertices: List[str] = []
+        # Contador de alterações: sobe a cada mutação, invalida as vistas em cache
+        self._versao = 0
+        self._visao = None  # (versão, VisaoNaoDirecionada)
+        self._compacta = None  # (versão, AdjacenciaCompacta)
+        self._usar_compacta = False
+        self._cache_resultados: Optional[CacheResultados] = None
 
     # --- Métodos que as subclasses implementam ---
     def inserir_vertice(self, label: str) -> bool:
         raise NotImplementedError
 
+    def inserir_vertices(self, labels: List[str]) -> bool:
+        """Insere vários vértices de uma vez (subclasses podem otimizar)."""
+        for label in labels:
+            self.inserir_vertice(label)
+        return True
+
     def remover_vertice(self, indice: int) -> bool:
         raise NotImplementedError
 
@@ -38,91 +60,292 @@ class Grafo:
     def retornar_vizinhos(self, vertice: int) -> List[int]:
         raise NotImplementedError
 
+    def vizinhos_com_peso(self, vertice: int) -> List[Tuple[int, float]]:
+        """Pares (vizinho, peso) de uma vez, sem um peso_aresta por vizinho."""
+        return [(u, self.peso_aresta(vertice, u)) for u in self.retornar_vizinhos(vertice)]
+
+    def _acesso_vizinhos(self) -> Callable[[int], Iterable[int]]:
+        """
+        Função v -> vizinhos que os laços de algoritmos usam (v sempre válido).
+        Subclasses trocam por leitura direta da própria estrutura, sem cópia.
+        """
+        return self.retornar_vizinhos
+
+    def _acesso_ponderado(self) -> Callable[[int], Iterable[Tuple[int, float]]]:
+        """Como _acesso_vizinhos, com pares (vizinho, peso)."""
+        return self.vizinhos_com_peso
+
+    def _adjacencia_reversa(self) -> Callable[[int], List[Tuple[int, float]]]:
+        """
+        Função v -> [(u, peso)] das arestas u->v. Não-direcionado: os próprios
+        vizinhos. Direcionado: monta a lista reversa inteira (O(V+E)) uma vez
+        por chamada; subclasses com acesso mais barato sobrescrevem.
+        """
+        if not self.direcionado:
+            return self.vizinhos_com_peso
+        reversa: List[List[Tuple[int, float]]] = [[] for _ in range(len(self.vertices))]
+        for u in range(len(self.vertices)):
+            for v, w in self.vizinhos_com_peso(u):
+                reversa[v].append((u, w))
+        return reversa.__getitem__
+
+    def freeze(self) -> "Grafo":
+        """Cópia imutável em CSR (grafo_csr.GrafoCSR)."""
+        raise NotImplementedError
+
+    # --- Versão e vistas em cache ---
+    @property
+    def versao(self) -> int:
+        """Muda sempre que vértices ou arestas mudam pelos métodos do grafo."""
+        return self._versao
+
+    def _modificado(self) -> None:
+        self._versao += 1
+
+    def visao_nao_direcionada(self):
+        """
+        grafo_csr.VisaoNaoDirecionada do grafo atual, montada uma vez e reusada
+        até a próxima alteração (coloração, Prim, Kruskal...).
+        Escrever direto em matriz/lista_adj não é detectado.
+        """
+        if self._visao is None or self._visao[0] != self._versao:
+            from grafo_csr import VisaoNaoDirecionada  # grafo_csr importa este módulo
+            with fase(self, "visao"):
+                self._visao = (self._versao, VisaoNaoDirecionada.de_grafo(self))
+        return self._visao[1]
+
+    def adjacencia_compacta(self) -> AdjacenciaCompacta:
+        """
+        Vizinhos e pesos (float) de cada vértice em listas Python, a partir do
+        freeze(). Mesmo cache por versão da visao_nao_direcionada.
+        """
+        if self._compacta is None or self._compacta[0] != self._versao:
+            with fase(self, "adjacencia_compacta"):
+                csr = self.freeze()
+                pesos = csr.pesos if csr.ponderado else None
+                self._compacta = (self._versao, adjacencia_compacta(csr.indptr, csr.indices, pesos))
+        return self._compacta[1]
+
+    def ativar_adjacencia_compacta(self) -> None:
+        """
+        Faz BFS/DFS/Dijkstra percorrerem adjacencia_compacta() em vez do acesso
+        direto do backend. Compensa com muitas consultas entre alterações; custa
+        uma cópia O(V+E) em objetos Python, refeita após cada alteração.
+        """
+        self._usar_compacta = True
+
+    def desativar_adjacencia_compacta(self) -> None:
+        self._usar_compacta = False
+        self._compacta = None
+
+    # --- Cache de resultados (opcional) ---
+    def ativar_cache(self, limite_bytes: int = LIMITE_PADRAO) -> CacheResultados:
+        """
+        Liga o cache LRU de bfs/dfs/dijkstra por origem (ver cache_resultados).
+        Qualquer alteração pelos métodos do grafo invalida tudo. Chamar de novo
+        troca o limite e recomeça vazio.
+        """
+        self._cache_resultados = CacheResultados(limite_bytes)
+        return self._cache_resultados
+
+    def desativar_cache(self) -> None:
+        self._cache_resultados = None
+
+    def estatisticas_cache(self) -> Optional[EstatisticasCache]:
+        """Acertos/falhas/despejos do cache, ou None se desligado."""
+        return None if self._cache_resultados is None else self._cache_resultados.estatisticas()
+
+    def _em_cache(self, algoritmo: str, origem, calcular):
+        if self._cache_resultados is None:
+            return calcular()
+        return self._cache_resultados.obter(self._versao, (algoritmo, origem), calcular)
+
     # --- Algoritmos movidos para dentro de Grafo ---
+    @instrumentado("bfs")
     def bfs(self, origem: int = 0) -> List[int]:
-        """Busca em Largura (ordem de visita)."""
+        """Busca em Largura (ordem de visita), ver algoritmos.busca_em_largura."""
+        return self._em_cache("bfs", origem, lambda: busca_em_largura(self, origem))
+
+    @instrumentado("bfs_niveis")
+    def bfs_niveis(self, origens: Union[int, Iterable[int]] = 0) -> ResultadoBFS:
+        """
+        BFS sincronizada por nível, com distâncias em saltos e pais.
+        Aceita uma origem ou várias (multi-origem: todas no nível 0).
+        Versão genérica, só de cima para baixo; GrafoCSR e GrafoMatriz
+        sobrescrevem com expansão vetorizada que alterna de direção.
+        O pai de v é o primeiro vértice (em ordem de índice) do nível anterior
+        que tem aresta para v.
+        """
         n = len(self.vertices)
-        if origem < 0 or origem >= n:
-            return []
-        visitados = [False] * n
-        ordem = []
-        fila = deque([origem])
-        visitados[origem] = True
-        while fila:
-            v = fila.popleft()
-            ordem.append(v)
-            for u in self.retornar_vizinhos(v):
-                if not visitados[u]:
-                    visitados[u] = True
-                    fila.append(u)
-        return ordem
+        dist = [-1] * n
+        pai = [-1] * n
+        raiz = [-1] * n
+        fronteira = normalizar_origens(origens, n).tolist()
+        for o in fronteira:
+            dist[o] = 0
+            raiz[o] = o
+        ordem = list(fronteira)
+        vizinhos = vizinhanca(self)
+        nivel = 0
+        while fronteira:
+            nivel += 1
+            proximos = []
+            for v in fronteira:
+                for u in vizinhos(v):
+                    if dist[u] < 0:
+                        u = int(u)
+                        dist[u] = nivel
+                        pai[u] = v
+                        raiz[u] = raiz[v]
+                        proximos.append(u)
+            proximos.sort()
+            ordem.extend(proximos)
+            fronteira = proximos
+        return ResultadoBFS(ordem, np.array(dist, dtype=np.int64), np.array(pai, dtype=np.int64),
+                            np.array(raiz, dtype=np.int64))
 
+    @instrumentado("dfs")
     def dfs(self, origem: int = 0) -> List[int]:
-        """Busca em Profundidade (ordem de visita)."""
-        n = len(self.vertices)
-        if origem < 0 or origem >= n:
-            return []
-        visitados = [False] * n
-        ordem: List[int] = []
-        def rec(v: int):
-            visitados[v] = True
-            ordem.append(v)
-            for u in self.retornar_vizinhos(v):
-                if not visitados[u]:
-                    rec(u)
-        rec(origem)
-        return ordem
-
-    def dijkstra(self, origem: int = 0) -> Tuple[List[Optional[float]], Dict[int, List[int]]]:
+        """Busca em Profundidade (ordem de visita). Iterativa, ver algoritmos.dfs_iterativa."""
+        return self._em_cache("dfs", origem, lambda: dfs_iterativa(self, origem).ordem)
+
+    @instrumentado("dfs_completa")
+    def dfs_completa(self, origem: Optional[int] = 0) -> ResultadoDFS:
+        """DFS com tempos de descoberta/término e pais (origem=None: floresta toda)."""
+        return dfs_iterativa(self, origem)
+
+    @instrumentado("ordenacao_topologica")
+    def ordenacao_topologica(self) -> Optional[List[int]]:
+        return ordenacao_topologica(self)
+
+    @instrumentado("componentes_fortemente_conexas")
+    def componentes_fortemente_conexas(self) -> List[List[int]]:
+        return componentes_fortemente_conexas(self)
+
+    @instrumentado("dijkstra")
+    def dijkstra(self, origem: int = 0, materializar: bool = False):
         """
         Dijkstra a partir de 'origem' (default 0).
-        Retorna (distancias, caminhos), onde distancias[i] é:
+        Retorna um ResultadoDijkstra (desempacotável como (distancias, caminhos)),
+        onde distancias[i] é:
           - distância mínima (float) se alcançável
           - None se inalcançável (evita 'inf' como você pediu)
-        Caminhos inalcançáveis vêm como [].
+        Os caminhos são montados sob demanda a partir dos predecessores;
+        inalcançáveis vêm como []. materializar=True devolve a tupla antiga
+        (distancias, dict com todos os caminhos).
+        Roda só quando ponderado=True. Núcleo em algoritmos.distancias_dijkstra.
+        """
+        resultado = self._em_cache("dijkstra", origem,
+                                   lambda: self._resultado_dijkstra(*distancias_dijkstra(self, origem)))
+        return resultado.como_tupla() if materializar else resultado
+
+    @staticmethod
+    def _resultado_dijkstra(dist, pred) -> ResultadoDijkstra:
+        """Troca inf -> None e embrulha em ResultadoDijkstra."""
+        inf = float('inf')
+        dist_out: List[Optional[float]] = [None if d == inf else d for d in dist]  # <- nada de 'inf'
+        return ResultadoDijkstra(dist_out, list(pred))
+
+    # --- Caminho mais curto ponto a ponto ---
+    @instrumentado("caminho_mais_curto")
+    def caminho_mais_curto(self, origem: int, destino: int, modo: str = "dijkstra",
+                           heuristica: Optional[Callable[[int], float]] = None) -> ResultadoCaminho:
+        """
+        Caminho mínimo origem -> destino, parando assim que o destino é assentado.
+          modo="dijkstra":     Dijkstra com parada antecipada
+          modo="bidirecional": buscas a partir das duas pontas (usa a adjacência
+                               reversa em grafos direcionados)
+          modo="astar":        A* com heuristica(v) admissível (nunca maior que
+                               a distância real até o destino); se também for
+                               consistente nenhum vértice é reaberto
+                               (ex.: caminhos.heuristica_grande_circulo)
+        Grafos não ponderados usam peso 1. Retorna ResultadoCaminho com o número
+        de vértices assentados, para medir a poda.
         """
         n = len(self.vertices)
-        if origem < 0 or origem >= n:
-            return [], {}
-        if not self.ponderado:
-            # roda só quando ponderado=True
-            return [], {}
-
-        dist = [float('inf')] * n
-        pred = [-1] * n
-        visit = [False] * n
-        dist[origem] = 0.0
-        pq: List[Tuple[float, int]] = [(0.0, origem)]
+        if origem < 0 or origem >= n or destino < 0 or destino >= n:
+            return ResultadoCaminho(None, [], 0)
+        if modo == "bidirecional":
+            return self._caminho_bidirecional(origem, destino)
+        if modo == "astar":
+            if heuristica is None:
+                raise ValueError("modo='astar' precisa de uma heuristica")
+            return self._caminho_heuristico(origem, destino, heuristica)
+        if modo != "dijkstra":
+            raise ValueError(f"Modo desconhecido: {modo!r}")
+        return self._caminho_heuristico(origem, destino, lambda v: 0.0)
 
+    def _caminho_heuristico(self, origem: int, destino: int,
+                            h: Callable[[int], float]) -> ResultadoCaminho:
+        """
+        A* (h = 0 é o Dijkstra com parada antecipada). Vértice fechado que
+        ganha distância menor é reaberto, então basta h admissível.
+        """
+        dist: Dict[int, float] = {origem: 0.0}
+        pred: Dict[int, int] = {origem: -1}
+        fechado = set()
+        vizinhos = vizinhanca_ponderada(self)
+        pq: List[Tuple[float, int]] = [(h(origem), origem)]
         while pq:
-            d_atual, v = heapq.heappop(pq)
-            if visit[v]:
+            _, v = heapq.heappop(pq)
+            if v in fechado:
                 continue
-            visit[v] = True
-
-            for u in self.retornar_vizinhos(v):
-                peso = self.peso_aresta(v, u)
-                if peso is None:
-                    continue
-                nd = d_atual + float(peso)
-                if nd < dist[u]:
+            fechado.add(v)
+            if v == destino:
+                return ResultadoCaminho(dist[v], self._caminho_de(pred, destino), len(fechado))
+            d_v = dist[v]
+            for u, peso in vizinhos(v):
+                u = int(u)
+                nd = d_v + float(peso)
+                if nd < dist.get(u, float('inf')):
                     dist[u] = nd
                     pred[u] = v
-                    heapq.heappush(pq, (nd, u))
-
-        # Reconstrói caminhos e troca inf -> None
-        caminhos: Dict[int, List[int]] = {}
-        dist_out: List[Optional[float]] = []
-        for i in range(n):
-            if dist[i] == float('inf'):
-                dist_out.append(None)  # <- nada de 'inf'
-                caminhos[i] = []
-            else:
-                dist_out.append(dist[i])
-                caminho = []
-                a = i
-                while a != -1:
-                    caminho.append(a)
-                    a = pred[a]
-                caminhos[i] = list(reversed(caminho))
-        return dist_out, caminhos
+                    fechado.discard(u)
+                    heapq.heappush(pq, (nd + h(u), u))
+        return ResultadoCaminho(None, [], len(fechado))
+
+    def _caminho_bidirecional(self, origem: int, destino: int) -> ResultadoCaminho:
+        if origem == destino:
+            return ResultadoCaminho(0.0, [origem], 1)
+        inf = float('inf')
+        vizinhos = (vizinhanca_ponderada(self), self._adjacencia_reversa())
+        dist: Tuple[Dict[int, float], Dict[int, float]] = ({origem: 0.0}, {destino: 0.0})
+        pred: Tuple[Dict[int, int], Dict[int, int]] = ({origem: -1}, {destino: -1})
+        fechado = (set(), set())
+        pq: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0.0, origem)], [(0.0, destino)])
+        melhor = inf
+        encontro = -1
+        while pq[0] and pq[1]:
+            if pq[0][0][0] + pq[1][0][0] >= melhor:
+                break
+            lado = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+            outro = 1 - lado
+            d_v, v = heapq.heappop(pq[lado])
+            if v in fechado[lado]:
+                continue
+            fechado[lado].add(v)
+            for u, peso in vizinhos[lado](v):
+                u = int(u)
+                nd = d_v + float(peso)
+                if nd < dist[lado].get(u, inf):
+                    dist[lado][u] = nd
+                    pred[lado][u] = v
+                    heapq.heappush(pq[lado], (nd, u))
+                total = dist[lado][u] + dist[outro].get(u, inf)
+                if total < melhor:
+                    melhor, encontro = total, u
+        assentados = len(fechado[0]) + len(fechado[1])
+        if encontro == -1:
+            return ResultadoCaminho(None, [], assentados)
+        ida = self._caminho_de(pred[0], encontro)
+        volta = self._caminho_de(pred[1], encontro)
+        return ResultadoCaminho(melhor, ida + volta[-2::-1], assentados)
+
+    @staticmethod
+    def _caminho_de(pred: Dict[int, int], v: int) -> List[int]:
+        caminho = []
+        while v != -1:
+            caminho.append(v)
+            v = pred[v]
+        caminho.reverse()
+        return caminho
@@ -0,0 +1,433 @@
+import numpy as np
+from typing import Callable, Iterable, List, Optional, Sequence, Set, Tuple, Union
+from grafo import Grafo
+from algoritmos import ResultadoBFS, normalizar_origens, vizinhanca_csr, vizinhanca_ponderada_csr
+from instrumentacao import instrumentado
+
+# BFS com direção alternada (Beamer et al.): passa para baixo-cima quando as
+# arestas da fronteira passam de 1/ALFA das arestas ainda não exploradas, e
+# volta para cima-baixo quando a fronteira cai abaixo de V/BETA.
+ALFA_BFS = 14.0
+BETA_BFS = 24.0
+# No passo baixo-cima, com poucos pendentes é mais barato reunir o resto das
+# listas de uma vez do que continuar uma rodada por vizinho.
+_CAUDA_BAIXO_CIMA = 1024
+
+
+def dtype_indices(n: int):
+    """int32 basta para índices de vértice enquanto V < 2^31."""
+    return np.int32 if n < 2**31 else np.int64
+
+
+def faixas_csr(inicios: np.ndarray, contagens: np.ndarray):
+    """
+    Posições de várias faixas [inicio, inicio + contagem) de indices/pesos,
+    concatenadas, e a qual faixa cada posição pertence (0..len(inicios)-1).
+    """
+    total = int(contagens.sum())
+    deslocamento = inicios - (np.cumsum(contagens) - contagens)
+    posicoes = np.repeat(deslocamento, contagens) + np.arange(total)
+    return posicoes, np.repeat(np.arange(len(inicios)), contagens)
+
+
+def csr_de_arestas(n: int, origens, destinos, pesos=None, direcionado: bool = True):
+    """
+    Monta (indptr, indices, pesos) a partir de uma lista de arestas em arrays.
+
+    Segue a mesma semântica de inserir_aresta repetido em GrafoLista:
+      - aresta repetida: vale o peso da ÚLTIMA ocorrência, e ela fica na
+        posição em que essa última ocorrência aconteceu;
+      - não-direcionado: (u, v) e (v, u) são a mesma aresta e entram nos dois
+        sentidos (laço u == u entra uma vez só).
+    Os vizinhos de cada vértice ficam na ordem de inserção, então BFS/DFS
+    visitam na mesma ordem que na lista de adjacência.
+    """
+    origens = np.asarray(origens, dtype=np.int64).ravel()
+    destinos = np.asarray(destinos, dtype=np.int64).ravel()
+    m = len(origens)
+    if len(destinos) != m:
+        raise ValueError("origens e destinos com tamanhos diferentes")
+    if pesos is None:
+        pesos = np.ones(m, dtype=np.float64)
+    else:
+        pesos = np.asarray(pesos, dtype=np.float64).ravel()
+        if len(pesos) != m:
+            raise ValueError("pesos com tamanho diferente das arestas")
+    if m and (min(origens.min(), destinos.min()) < 0 or max(origens.max(), destinos.max()) >= n):
+        raise ValueError("Índice de vértice fora do intervalo")
+
+    # Chave da aresta: par ordenado (direcionado) ou não-ordenado
+    if direcionado:
+        chave = origens * n + destinos
+    else:
+        chave = np.minimum(origens, destinos) * n + np.maximum(origens, destinos)
+
+    # Última ocorrência de cada chave, mantendo a ordem do arquivo
+    _, idx_rev = np.unique(chave[::-1], return_index=True)
+    ultimas = np.sort(m - 1 - idx_rev)
+    src, dst, w, pos = origens[ultimas], destinos[ultimas], pesos[ultimas], ultimas
+
+    if not direcionado:
+        volta = src != dst
+        src, dst, w, pos = (np.concatenate((src, dst[volta])),
+                            np.concatenate((dst, src[volta])),
+                            np.concatenate((w, w[volta])),
+                            np.concatenate((pos, pos[volta])))
+
+    # Direcionado já está em ordem de posição: basta ordenar estável por origem
+    ordem = np.argsort(src, kind="stable") if direcionado else np.lexsort((pos, src))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    indices = dst[ordem].astype(dtype_indices(n))
+    return indptr, indices, w[ordem]
+
+
+class RotulosNumericos(Sequence[str]):
+    """Rótulos "0".."n-1" sem materializar a lista (carga O(1) do cache)."""
+
+    def __init__(self, n: int):
+        self._n = n
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [str(i) for i in range(*indice.indices(self._n))]
+        if indice < 0:
+            indice += self._n
+        if indice < 0 or indice >= self._n:
+            raise IndexError("Índice fora do intervalo")
+        return str(indice)
+
+
+class GrafoCSR(Grafo):
+    """
+    Grafo IMUTÁVEL em formato CSR (compressed sparse row).
+
+    Os vizinhos de v são indices[indptr[v]:indptr[v+1]] e os pesos
+    correspondentes estão na mesma faixa de `pesos`. Em grafos
+    não-direcionados cada aresta aparece nos dois sentidos.
+    Métodos de alteração retornam False.
+    """
+
+    def __init__(self, direcionado: bool, ponderado: bool, indptr, indices,
+                 pesos=None, vertices: Optional[Sequence[str]] = None):
+        super().__init__(direcionado, ponderado)
+        self.indptr: np.ndarray = np.asarray(indptr)
+        self.indices: np.ndarray = np.asarray(indices)
+        self.pesos: Optional[np.ndarray] = None if pesos is None else np.asarray(pesos)
+        n = len(self.indptr) - 1
+        self._transposta: Optional["GrafoCSR"] = None
+        self._entrada_ordenada: Optional["GrafoCSR"] = None
+        if vertices is None:
+            self.vertices = RotulosNumericos(n)
+        else:
+            self.vertices = vertices if isinstance(vertices, RotulosNumericos) else list(vertices)
+            if len(self.vertices) != n:
+                raise ValueError("Quantidade de rótulos diferente de V")
+
+    @classmethod
+    def de_csr(cls, direcionado: bool, ponderado: bool, indptr, indices, pesos=None,
+               vertices: Optional[Sequence[str]] = None) -> "GrafoCSR":
+        """Usa os arrays como estão (inclusive np.memmap), sem copiar."""
+        return cls(direcionado, ponderado, indptr, indices, pesos if ponderado else None, vertices)
+
+    @classmethod
+    def de_arestas(cls, direcionado: bool, ponderado: bool, n: int, origens, destinos,
+                   pesos=None, vertices: Optional[Sequence[str]] = None) -> "GrafoCSR":
+        """Constrói em lote a partir de arrays de arestas (ver csr_de_arestas)."""
+        if not ponderado:
+            pesos = None
+        indptr, indices, w = csr_de_arestas(n, origens, destinos, pesos, direcionado)
+        return cls.de_csr(direcionado, ponderado, indptr, indices, w, vertices)
+
+    # --- Grafo imutável: alterações não são suportadas ---
+    def inserir_vertice(self, label: str) -> bool:
+        return False
+
+    def inserir_vertices(self, labels) -> bool:
+        return False
+
+    def remover_vertice(self, indice: int) -> bool:
+        return False
+
+    def inserir_aresta(self, origem: int, destino: int, peso: float = 1) -> bool:
+        return False
+
+    def remover_aresta(self, origem: int, destino: int) -> bool:
+        return False
+
+    def imprimir_grafo(self) -> None:
+        for v in range(len(self.vertices)):
+            ini, fim = self.indptr[v], self.indptr[v + 1]
+            print(f"{self.vertices[v]}: ", end="")
+            if self.pesos is None:
+                print(" ".join(f"(→{u} [1])" for u in self.indices[ini:fim]))
+            else:
+                print(" ".join(f"(→{u} [{w}])" for u, w in zip(self.indices[ini:fim], self.pesos[ini:fim])))
+
+    def _posicao(self, origem: int, destino: int) -> int:
+        """Posição de origem→destino em `indices`, ou -1."""
+        if origem < 0 or destino < 0 or origem >= len(self.vertices) or destino >= len(self.vertices):
+            return -1
+        ini = self.indptr[origem]
+        achados = np.flatnonzero(self.indices[ini:self.indptr[origem + 1]] == destino)
+        return int(ini + achados[0]) if len(achados) else -1
+
+    def existe_aresta(self, origem: int, destino: int) -> bool:
+        return self._posicao(origem, destino) >= 0
+
+    def peso_aresta(self, origem: int, destino: int) -> Optional[float]:
+        pos = self._posicao(origem, destino)
+        if pos < 0:
+            return None
+        return 1.0 if self.pesos is None else float(self.pesos[pos])
+
+    def retornar_vizinhos(self, vertice: int) -> np.ndarray:
+        """Fatia (view, sem cópia) de `indices`."""
+        if vertice < 0 or vertice >= len(self.vertices):
+            return self.indices[:0]
+        return self.indices[self.indptr[vertice]:self.indptr[vertice + 1]]
+
+    def vizinhos_com_peso(self, vertice: int) -> List[Tuple[int, float]]:
+        if vertice < 0 or vertice >= len(self.vertices):
+            return []
+        ini, fim = self.indptr[vertice], self.indptr[vertice + 1]
+        vizinhos = self.indices[ini:fim].tolist()
+        if self.pesos is None:
+            return [(u, 1.0) for u in vizinhos]
+        return list(zip(vizinhos, self.pesos[ini:fim].tolist()))
+
+    def _acesso_vizinhos(self) -> Callable[[int], Iterable[int]]:
+        return vizinhanca_csr(self.indptr, self.indices)
+
+    def _acesso_ponderado(self) -> Callable[[int], Iterable[Tuple[int, float]]]:
+        return vizinhanca_ponderada_csr(self.indptr, self.indices, self.pesos)
+
+    def transposta(self) -> "GrafoCSR":
+        """Grafo com todas as arestas invertidas (calculado uma vez e guardado).
+        Em grafos não-direcionados é o próprio grafo."""
+        if not self.direcionado:
+            return self
+        if self._transposta is None:
+            n = len(self.vertices)
+            origens = np.repeat(np.arange(n, dtype=self.indices.dtype), np.diff(self.indptr))
+            ordem = np.argsort(self.indices, kind="stable")
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=n), out=indptr[1:])
+            pesos = None if self.pesos is None else self.pesos[ordem]
+            self._transposta = GrafoCSR(True, self.ponderado, indptr, origens[ordem], pesos, self.vertices)
+            self._transposta._transposta = self
+        return self._transposta
+
+    def entrada_ordenada(self) -> "GrafoCSR":
+        """
+        Arestas que chegam em cada vértice, com cada lista em ordem crescente de
+        origem e sem pesos: no baixo-cima o primeiro vizinho achado na
+        fronteira é o de menor índice. A transposta montada aqui já sai assim;
+        não-direcionado (ou transposta vinda de fora) ganha uma cópia ordenada
+        de `indices`. Calculado uma vez e guardado.
+        """
+        if self._entrada_ordenada is None:
+            reversa = self.transposta()
+            indptr, indices = reversa.indptr, reversa.indices
+            # já ordenado se só cai de valor onde começa uma lista nova
+            quedas = np.flatnonzero(indices[1:] < indices[:-1]) + 1
+            if not np.isin(quedas, indptr).all():
+                linhas = np.repeat(np.arange(len(self.vertices), dtype=np.int64), np.diff(indptr))
+                indices = indices[np.lexsort((indices, linhas))]
+            self._entrada_ordenada = GrafoCSR(True, False, reversa.indptr, indices, None, self.vertices)
+        return self._entrada_ordenada
+
+    # --- BFS por níveis com direção alternada ---
+    @instrumentado("bfs_niveis")
+    def bfs_niveis(self, origens: Union[int, Iterable[int]] = 0,
+                   alfa: float = ALFA_BFS, beta: float = BETA_BFS) -> ResultadoBFS:
+        """
+        BFS por níveis vetorizada sobre os arrays CSR. Cada nível é expandido
+        de cima para baixo (arestas que saem da fronteira) ou de baixo para
+        cima (cada vértice não visitado procura um pai na fronteira, parando
+        no primeiro), escolhendo pela heurística de Beamer. Em grafos de
+        diâmetro pequeno os níveis do meio quase não tocam arestas.
+        Os dois sentidos dão o mesmo pai: o vértice de menor índice do nível
+        anterior com aresta para v, como em Grafo.bfs_niveis e GrafoMatriz.
+        O baixo-cima usa entrada_ordenada() (calculada uma vez).
+        """
+        n = len(self.vertices)
+        dist = np.full(n, -1, dtype=np.int64)
+        pai = np.full(n, -1, dtype=np.int64)
+        raiz = np.full(n, -1, dtype=np.int64)
+        fronteira = normalizar_origens(origens, n)
+        dist[fronteira] = 0
+        raiz[fronteira] = fronteira
+        ordem = fronteira.tolist()
+
+        reversa = self.entrada_ordenada()
+        grau = np.diff(self.indptr)
+        grau_entrada = np.diff(reversa.indptr)
+        restantes = int(grau_entrada.sum()) - int(grau_entrada[fronteira].sum())
+        baixo_cima = False
+        nivel = 0
+        while len(fronteira):
+            if not baixo_cima and int(grau[fronteira].sum()) > restantes / alfa:
+                baixo_cima = True
+            elif baixo_cima and len(fronteira) < n / beta:
+                baixo_cima = False
+            if baixo_cima:
+                novos, pais = self._nivel_baixo_cima(reversa, fronteira, dist)
+            else:
+                novos, pais = self._nivel_cima_baixo(fronteira, dist)
+            nivel += 1
+            dist[novos] = nivel
+            pai[novos] = pais
+            raiz[novos] = raiz[pais]
+            restantes -= int(grau_entrada[novos].sum())
+            ordem.extend(novos.tolist())
+            fronteira = novos
+        return ResultadoBFS(ordem, dist, pai, raiz)
+
+    def _nivel_cima_baixo(self, fronteira: np.ndarray, dist: np.ndarray):
+        inicios = self.indptr[fronteira]
+        posicoes, faixa = faixas_csr(inicios, self.indptr[fronteira + 1] - inicios)
+        destinos = self.indices[posicoes]
+        livres = dist[destinos] < 0
+        # fronteira está ordenada: o primeiro que aparece é o pai de menor índice
+        novos, primeira = np.unique(destinos[livres], return_index=True)
+        return novos.astype(np.int64), fronteira[faixa[livres][primeira]]
+
+    @staticmethod
+    def _nivel_baixo_cima(reversa: "GrafoCSR", fronteira: np.ndarray, dist: np.ndarray):
+        na_fronteira = np.zeros(len(dist), dtype=bool)
+        na_fronteira[fronteira] = True
+        pendentes = np.flatnonzero(dist < 0)
+        pos = reversa.indptr[pendentes]
+        fim = reversa.indptr[pendentes + 1]
+        vivos = pos < fim
+        pendentes, pos, fim = pendentes[vivos], pos[vivos], fim[vivos]
+        achados, pais = [], []
+        # Uma rodada por posição na lista de entrada: quem acha pai sai
+        while len(pendentes) > _CAUDA_BAIXO_CIMA:
+            candidatos = reversa.indices[pos]
+            ok = na_fronteira[candidatos]
+            achados.append(pendentes[ok])
+            pais.append(candidatos[ok])
+            pos = pos + 1
+            vivos = ~ok & (pos < fim)
+            pendentes, pos, fim = pendentes[vivos], pos[vivos], fim[vivos]
+        if len(pendentes):
+            posicoes, faixa = faixas_csr(pos, fim - pos)
+            candidatos = reversa.indices[posicoes]
+            ok = na_fronteira[candidatos]
+            _, primeira = np.unique(faixa[ok], return_index=True)
+            achados.append(pendentes[faixa[ok][primeira]])
+            pais.append(candidatos[ok][primeira])
+        if not achados:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        novos = np.concatenate(achados)
+        ordem = np.argsort(novos)
+        return novos[ordem].astype(np.int64), np.concatenate(pais)[ordem].astype(np.int64)
+
+    def _adjacencia_reversa(self):
+        return self.transposta().vizinhos_com_peso
+
+    def freeze(self) -> "GrafoCSR":
+        return self
+
+
+class VisaoNaoDirecionada:
+    """
+    Vista simétrica e compacta de um grafo, para coloração e AGM
+    (Grafo.visao_nao_direcionada guarda em cache). Todo par {a, b}, a != b,
+    ligado em algum sentido vira uma aresta não-direcionada com o menor peso
+    entre a->b e b->a (1.0 se o grafo não for ponderado); laços somem.
+
+      origens, destinos, pesos: cada aresta uma vez, a < b, na ordem em que o
+          par aparece primeiro percorrendo os vizinhos de 0, 1, 2, ...
+      indptr, indices, pesos_adj: CSR com os dois sentidos.
+
+    As listas devolvidas pelos métodos são compartilhadas: não modificar.
+    """
+
+    def __init__(self, n: int, origens: np.ndarray, destinos: np.ndarray, pesos: np.ndarray):
+        self.n = n
+        self.origens = origens
+        self.destinos = destinos
+        self.pesos = pesos
+        self.indptr, self.indices, self.pesos_adj = csr_de_arestas(n, origens, destinos, pesos, direcionado=False)
+        self._conjuntos: Optional[List[Set[int]]] = None
+        self._ponderada: Optional[List[List[Tuple[int, float]]]] = None
+
+    @classmethod
+    def de_grafo(cls, grafo: Grafo) -> "VisaoNaoDirecionada":
+        csr = grafo.freeze()
+        n = len(csr.vertices)
+        u = np.repeat(np.arange(n, dtype=np.int64), np.diff(csr.indptr))
+        v = np.asarray(csr.indices, dtype=np.int64)
+        if csr.ponderado and csr.pesos is not None:
+            w = np.asarray(csr.pesos, dtype=np.float64)
+        else:
+            w = np.ones(len(v))
+        fora_laco = u != v
+        u, v, w = u[fora_laco], v[fora_laco], w[fora_laco]
+        a, b = np.minimum(u, v), np.maximum(u, v)
+        if len(a) == 0:
+            vazio = np.empty(0, dtype=np.int64)
+            return cls(n, vazio, vazio, np.empty(0))
+        # agrupa por par (estável: o primeiro de cada grupo é a primeira ocorrência)
+        chave = a * n + b
+        ordem = np.argsort(chave, kind="stable")
+        chave = chave[ordem]
+        inicios = np.flatnonzero(np.r_[True, chave[1:] != chave[:-1]])
+        menor_peso = np.minimum.reduceat(w[ordem], inicios)
+        primeira = ordem[inicios]
+        seq = np.argsort(primeira)
+        return cls(n, a[primeira][seq], b[primeira][seq], menor_peso[seq])
+
+    def grau(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def conjuntos(self) -> List[Set[int]]:
+        """Vizinhança como lista de sets (formato de build_undirected_adj)."""
+        if self._conjuntos is None:
+            ptr, ind = self.indptr.tolist(), self.indices.tolist()
+            self._conjuntos = [set(ind[ptr[v]:ptr[v + 1]]) for v in range(self.n)]
+        return self._conjuntos
+
+    def adjacencia_ponderada(self) -> List[List[Tuple[int, float]]]:
+        """[(vizinho, peso)] por vértice (formato de adj_undirected_weighted)."""
+        if self._ponderada is None:
+            ptr, ind, ws = self.indptr.tolist(), self.indices.tolist(), self.pesos_adj.tolist()
+            self._ponderada = [list(zip(ind[ptr[v]:ptr[v + 1]], ws[ptr[v]:ptr[v + 1]]))
+                               for v in range(self.n)]
+        return self._ponderada
+
+    def lista_arestas(self) -> List[Tuple[float, int, int]]:
+        """[(peso, a, b)] na ordem de primeira ocorrência (formato de edge_list_undirected)."""
+        return list(zip(self.pesos.tolist(), self.origens.tolist(), self.destinos.tolist()))
+
+
+if __name__ == "__main__":
+    # Confere bfs_niveis entre backends: mesmas distâncias, pais e raízes
+    # com a direção livre, só cima-baixo e só baixo-cima.
+    import geradores
+    from grafo_lista import GrafoLista
+    from grafo_matriz import GrafoMatriz
+
+    for direcionado in (False, True):
+        for semente in range(3):
+            gerado = geradores.erdos_renyi(3000, 0.003, semente=semente, direcionado=direcionado)
+            lista = geradores.construir(gerado, GrafoLista)
+            matriz = geradores.construir(gerado, GrafoMatriz)
+            csr = lista.freeze()
+            assert csr.freeze() is csr
+            for origens in (0, [0, 5, 9], range(0, 3000, 97)):
+                esperado = lista.bfs_niveis(origens)
+                resultados = [matriz.bfs_niveis(origens), csr.bfs_niveis(origens),
+                              csr.bfs_niveis(origens, alfa=1e-12),
+                              csr.bfs_niveis(origens, alfa=1e12, beta=1e12)]
+                for r in resultados:
+                    assert r.ordem == esperado.ordem
+                    for campo in ("distancias", "pais", "raizes"):
+                        assert np.array_equal(getattr(r, campo), getattr(esperado, campo)), campo
+    print("✅ bfs_niveis igual em lista, matriz e CSR (nos dois sentidos).")
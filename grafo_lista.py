@@ -1,5 +1,7 @@
-from typing import List, Optional
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from grafo import Grafo
+from grafo_csr import GrafoCSR, csr_de_arestas, dtype_indices
 
 class GrafoLista(Grafo):
     class Aresta:
@@ -13,10 +15,48 @@ class GrafoLista(Grafo):
     def __init__(self, direcionado: bool, ponderado: bool):
         super().__init__(direcionado, ponderado)
         self.lista_adj: List[List[GrafoLista.Aresta]] = []
+        # Índice por vértice destino → Aresta (mesmos objetos de lista_adj)
+        self.indice_adj: List[Dict[int, GrafoLista.Aresta]] = []
+
+    @classmethod
+    def de_csr(cls, direcionado: bool, ponderado: bool, indptr, indices, pesos=None,
+               vertices: Optional[Sequence[str]] = None) -> "GrafoLista":
+        """Constrói a partir de arrays CSR (ver grafo_csr), vizinhos na ordem dos arrays."""
+        n = len(indptr) - 1
+        grafo = cls(direcionado, ponderado)
+        grafo.inserir_vertices(vertices if vertices is not None else [str(i) for i in range(n)])
+        ptr, dst = np.asarray(indptr).tolist(), np.asarray(indices).tolist()
+        ws = np.asarray(pesos).tolist() if ponderado and pesos is not None else [1] * len(dst)
+        Aresta = cls.Aresta
+        grafo.lista_adj = [[Aresta(dst[j], ws[j]) for j in range(ptr[i], ptr[i + 1])] for i in range(n)]
+        grafo._reindexar()
+        grafo._modificado()
+        return grafo
+
+    @classmethod
+    def de_arestas(cls, direcionado: bool, ponderado: bool, n: int, origens, destinos,
+                   pesos=None, vertices: Optional[Sequence[str]] = None) -> "GrafoLista":
+        """Constrói em lote, equivalente a inserir_aresta aresta por aresta."""
+        indptr, indices, w = csr_de_arestas(n, origens, destinos, pesos if ponderado else None, direcionado)
+        return cls.de_csr(direcionado, ponderado, indptr, indices, w, vertices)
+
+    def _reindexar(self) -> None:
+        """Refaz o índice destino → Aresta a partir de lista_adj."""
+        self.indice_adj = [{a.destino: a for a in arestas} for arestas in self.lista_adj]
 
     def inserir_vertice(self, label: str) -> bool:
         self.vertices.append(label)
         self.lista_adj.append([])
+        self.indice_adj.append({})
+        self._modificado()
+        return True
+
+    def inserir_vertices(self, labels: Sequence[str]) -> bool:
+        labels = list(labels)
+        self.vertices.extend(labels)
+        self.lista_adj.extend([] for _ in labels)
+        self.indice_adj.extend({} for _ in labels)
+        self._modificado()
         return True
 
     def remover_vertice(self, indice: int) -> bool:
@@ -31,7 +71,8 @@ class GrafoLista(Grafo):
             for aresta in self.lista_adj[i]:
                 if aresta.destino > indice:
                     aresta.destino -= 1
-                    
+        self._reindexar()
+        self._modificado()
         return True
 
     def imprimir_grafo(self) -> None:
@@ -39,46 +80,77 @@ class GrafoLista(Grafo):
             print(f"{self.vertices[i]}: ", end="")
             print(" ".join(str(aresta) for aresta in arestas))
 
+    def _anexar(self, origem: int, destino: int, peso: float) -> None:
+        aresta = self.Aresta(destino, peso)
+        self.lista_adj[origem].append(aresta)
+        self.indice_adj[origem][destino] = aresta
+
     def inserir_aresta(self, origem: int, destino: int, peso: float = 1) -> bool:
         if origem < 0 or destino < 0 or origem >= len(self.vertices) or destino >= len(self.vertices):
             return False
         
         peso_final = peso if self.ponderado else 1
-        self.remover_aresta(origem, destino)
-        self.lista_adj[origem].append(self.Aresta(destino, peso_final))
+        # Aresta repetida vai para o fim da lista (mesma ordem de antes);
+        # remover_aresta já tira os dois sentidos quando não-direcionado
+        if destino in self.indice_adj[origem]:
+            self.remover_aresta(origem, destino)
+        self._anexar(origem, destino, peso_final)
         
-        if not self.direcionado:
-            self.remover_aresta(destino, origem)
-            self.lista_adj[destino].append(self.Aresta(origem, peso_final))
-            
+        if not self.direcionado and origem != destino:
+            self._anexar(destino, origem, peso_final)
+        self._modificado()
         return True
 
     def remover_aresta(self, origem: int, destino: int) -> bool:
         if origem < 0 or destino < 0 or origem >= len(self.vertices) or destino >= len(self.vertices):
             return False
         
-        self.lista_adj[origem] = [a for a in self.lista_adj[origem] if a.destino != destino]
+        if self.indice_adj[origem].pop(destino, None) is not None:
+            self.lista_adj[origem] = [a for a in self.lista_adj[origem] if a.destino != destino]
         
-        if not self.direcionado:
+        if not self.direcionado and self.indice_adj[destino].pop(origem, None) is not None:
             self.lista_adj[destino] = [a for a in self.lista_adj[destino] if a.destino != origem]
-            
+        self._modificado()
         return True
 
     def existe_aresta(self, origem: int, destino: int) -> bool:
         if origem < 0 or destino < 0 or origem >= len(self.vertices) or destino >= len(self.vertices):
             return False
-        return any(aresta.destino == destino for aresta in self.lista_adj[origem])
+        return destino in self.indice_adj[origem]
 
     def peso_aresta(self, origem: int, destino: int) -> Optional[float]:
-        if not self.existe_aresta(origem, destino):
+        if origem < 0 or destino < 0 or origem >= len(self.vertices) or destino >= len(self.vertices):
             return None
-            
-        for aresta in self.lista_adj[origem]:
-            if aresta.destino == destino:
-                return aresta.peso
-        return None
+        aresta = self.indice_adj[origem].get(destino)
+        return None if aresta is None else aresta.peso
 
     def retornar_vizinhos(self, vertice: int) -> List[int]:
         if vertice < 0 or vertice >= len(self.vertices):
             return []
-        return [aresta.destino for aresta in self.lista_adj[vertice]]
\ No newline at end of file
+        return [aresta.destino for aresta in self.lista_adj[vertice]]
+
+    def vizinhos_com_peso(self, vertice: int) -> List[Tuple[int, float]]:
+        if vertice < 0 or vertice >= len(self.vertices):
+            return []
+        return [(aresta.destino, aresta.peso) for aresta in self.lista_adj[vertice]]
+
+    def _acesso_vizinhos(self) -> Callable[[int], Iterable[int]]:
+        lista_adj = self.lista_adj
+        return lambda v: [aresta.destino for aresta in lista_adj[v]]
+
+    def _acesso_ponderado(self) -> Callable[[int], Iterable[Tuple[int, float]]]:
+        lista_adj = self.lista_adj
+        return lambda v: [(aresta.destino, aresta.peso) for aresta in lista_adj[v]]
+
+    def freeze(self) -> GrafoCSR:
+        n = len(self.vertices)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(arestas) for arestas in self.lista_adj], out=indptr[1:])
+        m = int(indptr[-1])
+        indices = np.fromiter((a.destino for arestas in self.lista_adj for a in arestas),
+                              dtype=dtype_indices(n), count=m)
+        pesos = None
+        if self.ponderado:
+            pesos = np.fromiter((a.peso for arestas in self.lista_adj for a in arestas),
+                                dtype=np.float64, count=m)
+        return GrafoCSR(self.direcionado, self.ponderado, indptr, indices, pesos, self.vertices)
@@ -1,29 +1,85 @@
 import numpy as np
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 from grafo import Grafo
+from algoritmos import ResultadoBFS, normalizar_origens
+from grafo_csr import GrafoCSR, csr_de_arestas, dtype_indices
+from instrumentacao import instrumentado
 
 class GrafoMatriz(Grafo):
     def __init__(self, direcionado: bool, ponderado: bool):
         super().__init__(direcionado, ponderado)
-        self.matriz: np.ndarray = np.array([], dtype=np.float32).reshape(0, 0)
+        # Buffer com capacidade >= V (dobra quando enche); fora de [:V, :V] é sempre 0
+        self._buffer: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+
+    @property
+    def matriz(self) -> np.ndarray:
+        """View V×V do buffer (sem cópia)."""
+        n = len(self.vertices)
+        return self._buffer[:n, :n]
+
+    @matriz.setter
+    def matriz(self, valor: np.ndarray) -> None:
+        self._buffer = np.asarray(valor, dtype=np.float32)
+        self._modificado()
+
+    @property
+    def capacidade(self) -> int:
+        return self._buffer.shape[0]
+
+    def _garantir_capacidade(self, n: int) -> None:
+        cap = self.capacidade
+        if n <= cap:
+            return
+        nova = max(n, 2 * cap, 4)
+        buffer = np.zeros((nova, nova), dtype=np.float32)
+        buffer[:cap, :cap] = self._buffer
+        self._buffer = buffer
+
+    @classmethod
+    def de_csr(cls, direcionado: bool, ponderado: bool, indptr, indices, pesos=None,
+               vertices: Optional[Sequence[str]] = None) -> "GrafoMatriz":
+        """Constrói a partir de arrays CSR (ver grafo_csr)."""
+        n = len(indptr) - 1
+        grafo = cls(direcionado, ponderado)
+        grafo.inserir_vertices(vertices if vertices is not None else [str(i) for i in range(n)])
+        linhas = np.repeat(np.arange(n), np.diff(indptr))
+        grafo.matriz[linhas, indices] = pesos if ponderado and pesos is not None else 1
+        grafo._modificado()
+        return grafo
+
+    @classmethod
+    def de_arestas(cls, direcionado: bool, ponderado: bool, n: int, origens, destinos,
+                   pesos=None, vertices: Optional[Sequence[str]] = None) -> "GrafoMatriz":
+        """Constrói em lote, equivalente a inserir_aresta aresta por aresta."""
+        indptr, indices, w = csr_de_arestas(n, origens, destinos, pesos if ponderado else None, direcionado)
+        return cls.de_csr(direcionado, ponderado, indptr, indices, w, vertices)
 
     def inserir_vertice(self, label: str) -> bool:
+        self._garantir_capacidade(len(self.vertices) + 1)
         self.vertices.append(label)
-        n = len(self.vertices)
-        
-        if n == 1:
-            self.matriz = np.zeros((1, 1), dtype=np.float32)
-        else:
-            self.matriz = np.pad(self.matriz, ((0, 1), (0, 1)), mode='constant', constant_values=0)
+        self._modificado()
+        return True
+
+    def inserir_vertices(self, labels: Sequence[str]) -> bool:
+        labels = list(labels)
+        self._garantir_capacidade(len(self.vertices) + len(labels))
+        self.vertices.extend(labels)
+        self._modificado()
         return True
 
     def remover_vertice(self, indice: int) -> bool:
         if indice < 0 or indice >= len(self.vertices):
             return False
         
+        # Compacta no próprio buffer: sobe as linhas e puxa as colunas seguintes
+        n = len(self.vertices)
+        b = self._buffer
+        b[indice:n - 1, :n] = b[indice + 1:n, :n]
+        b[:n - 1, indice:n - 1] = b[:n - 1, indice + 1:n]
+        b[n - 1, :n] = 0
+        b[:n, n - 1] = 0
         self.vertices.pop(indice)
-        self.matriz = np.delete(self.matriz, indice, axis=0)
-        self.matriz = np.delete(self.matriz, indice, axis=1)
+        self._modificado()
         return True
 
     def imprimir_grafo(self) -> None:
@@ -49,6 +105,7 @@ class GrafoMatriz(Grafo):
         self.matriz[origem, destino] = peso if self.ponderado else 1
         if not self.direcionado:
             self.matriz[destino, origem] = peso if self.ponderado else 1
+        self._modificado()
         return True
 
     def remover_aresta(self, origem: int, destino: int) -> bool:
@@ -58,6 +115,7 @@ class GrafoMatriz(Grafo):
         self.matriz[origem, destino] = 0
         if not self.direcionado:
             self.matriz[destino, origem] = 0
+        self._modificado()
         return True
 
     def existe_aresta(self, origem: int, destino: int) -> bool:
@@ -74,8 +132,81 @@ class GrafoMatriz(Grafo):
         if vertice < 0 or vertice >= len(self.vertices):
             return []
         
-        vizinhos = []
-        for i in range(len(self.vertices)):
-            if self.matriz[vertice, i] != 0:
-                vizinhos.append(i)
-        return vizinhos
\ No newline at end of file
+        return np.flatnonzero(self.matriz[vertice]).tolist()
+
+    def vizinhos_com_peso(self, vertice: int) -> List[Tuple[int, float]]:
+        if vertice < 0 or vertice >= len(self.vertices):
+            return []
+        linha = self.matriz[vertice]
+        colunas = np.flatnonzero(linha)
+        return list(zip(colunas.tolist(), linha[colunas].tolist()))
+
+    def _adjacencia_reversa(self):
+        """Arestas que chegam em v = coluna v da matriz (sem montar nada)."""
+        if not self.direcionado:
+            return self.vizinhos_com_peso
+
+        def antecessores(vertice: int) -> List[Tuple[int, float]]:
+            coluna = self.matriz[:, vertice]
+            linhas = np.flatnonzero(coluna)
+            return list(zip(linhas.tolist(), coluna[linhas].tolist()))
+        return antecessores
+
+    # --- Algoritmos que aproveitam a matriz densa ---
+    def bfs_matricial(self, origem: int = 0) -> Tuple[List[int], np.ndarray]:
+        """(ordem, distancias) de bfs_niveis, formato antigo."""
+        resultado = self.bfs_niveis(origem)
+        return resultado.ordem, resultado.distancias
+
+    @instrumentado("bfs_niveis")
+    def bfs_niveis(self, origens: Union[int, Iterable[int]] = 0) -> ResultadoBFS:
+        """
+        BFS por níveis na matriz: cada nível é o bloco fronteira × não visitados
+        (OU no semianel booleano). Fronteira pequena: corta as linhas da
+        fronteira primeiro (cima-baixo); poucos não visitados: corta as colunas
+        deles primeiro (baixo-cima). O pai é o vértice de menor índice da
+        fronteira com aresta para o novo vértice.
+        """
+        n = len(self.vertices)
+        dist = np.full(n, -1, dtype=np.int64)
+        pai = np.full(n, -1, dtype=np.int64)
+        raiz = np.full(n, -1, dtype=np.int64)
+        fronteira = normalizar_origens(origens, n)
+        dist[fronteira] = 0
+        raiz[fronteira] = fronteira
+        ordem = fronteira.tolist()
+        nivel = 0
+        while len(fronteira):
+            nao_visitados = np.flatnonzero(dist < 0)
+            if len(nao_visitados) == 0:
+                break
+            if len(fronteira) <= len(nao_visitados):
+                bloco = self.matriz[fronteira][:, nao_visitados] != 0
+            else:
+                bloco = self.matriz[:, nao_visitados][fronteira] != 0
+            alcancados = bloco.any(axis=0)
+            novos = nao_visitados[alcancados]
+            pais = fronteira[bloco[:, alcancados].argmax(axis=0)]
+            nivel += 1
+            dist[novos] = nivel
+            pai[novos] = pais
+            raiz[novos] = raiz[pais]
+            ordem.extend(novos.tolist())
+            fronteira = novos
+        return ResultadoBFS(ordem, dist, pai, raiz)
+
+    def dijkstra_denso(self, origem: int = 0, materializar: bool = False):
+        """
+        Dijkstra O(V²) sem heap (algoritmos.dijkstra_matriz). É o que
+        Grafo.dijkstra usa para a matriz; mesmo resultado do Dijkstra com heap.
+        """
+        return self.dijkstra(origem, materializar)
+
+    def freeze(self) -> GrafoCSR:
+        n = len(self.vertices)
+        linhas, colunas = np.nonzero(self.matriz)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(linhas, minlength=n), out=indptr[1:])
+        pesos = self.matriz[linhas, colunas].astype(np.float64) if self.ponderado else None
+        return GrafoCSR(self.direcionado, self.ponderado, indptr,
+                        colunas.astype(dtype_indices(n)), pesos, self.vertices)
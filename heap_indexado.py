@@ -0,0 +1,83 @@
+# heap_indexado.py
+from typing import Any, List, Tuple
+
+
+class HeapIndexado:
+    """
+    Heap binário de mínimo sobre vértices 0..n-1 com decrease-key: cada
+    vértice aparece no máximo uma vez, então o heap nunca passa de V itens
+    (o heapq com entradas repetidas cresce até O(E)).
+    Chaves podem ser qualquer coisa comparável (ex.: tuplas).
+    """
+
+    def __init__(self, n: int):
+        self.heap: List[int] = []
+        self.pos: List[int] = [-1] * n     # posição de v em heap, -1 = fora
+        self.chave: List[Any] = [None] * n
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, v: int) -> bool:
+        return self.pos[v] >= 0
+
+    def inserir_ou_diminuir(self, v: int, chave: Any) -> bool:
+        """Insere v ou diminui sua chave. False se v já estava com chave <= chave."""
+        i = self.pos[v]
+        if i < 0:
+            self.chave[v] = chave
+            self.heap.append(v)
+            self.pos[v] = len(self.heap) - 1
+            self._subir(len(self.heap) - 1)
+            return True
+        if chave < self.chave[v]:
+            self.chave[v] = chave
+            self._subir(i)
+            return True
+        return False
+
+    def extrair_min(self) -> Tuple[int, Any]:
+        heap = self.heap
+        topo = heap[0]
+        ultimo = heap.pop()
+        self.pos[topo] = -1
+        if heap:
+            heap[0] = ultimo
+            self.pos[ultimo] = 0
+            self._descer(0)
+        return topo, self.chave[topo]
+
+    def _subir(self, i: int) -> None:
+        heap, pos, chave = self.heap, self.pos, self.chave
+        v = heap[i]
+        cv = chave[v]
+        while i > 0:
+            p = (i - 1) >> 1
+            u = heap[p]
+            if not cv < chave[u]:
+                break
+            heap[i] = u
+            pos[u] = i
+            i = p
+        heap[i] = v
+        pos[v] = i
+
+    def _descer(self, i: int) -> None:
+        heap, pos, chave = self.heap, self.pos, self.chave
+        n = len(heap)
+        v = heap[i]
+        cv = chave[v]
+        while True:
+            f = 2 * i + 1
+            if f >= n:
+                break
+            if f + 1 < n and chave[heap[f + 1]] < chave[heap[f]]:
+                f += 1
+            u = heap[f]
+            if not chave[u] < cv:
+                break
+            heap[i] = u
+            pos[u] = i
+            i = f
+        heap[i] = v
+        pos[v] = i
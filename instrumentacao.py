@@ -0,0 +1,169 @@
+# instrumentacao.py
+"""
+Instrumentação opcional dos algoritmos de grafo.
+
+    with instrumentar(grafo) as perfil:
+        grafo.dijkstra(0)
+        prim(grafo)
+    perfil.como_dict()   # {"contadores": {...}, "fases": {...}, "tempo_total": ...}
+
+Enquanto o bloco está ativo:
+  - retornar_vizinhos/vizinhos_com_peso/peso_aresta/existe_aresta do grafo são
+    sombreados por versões que contam ("vizinhos", "vizinhos_arestas",
+    "peso_aresta", "existe_aresta");
+  - funções marcadas com @instrumentado (bfs, dfs, dijkstra, prim, kruskal,
+    colorações...) acumulam tempo e chamadas em perfil.fases;
+  - laços com heap contam "heap_push", "heap_pop" e "relaxacoes".
+Desligado, o custo é um getattr por chamada de algoritmo e um teste de None
+por laço; nada roda por vizinho ou por aresta.
+Ligado, BFS/DFS/Dijkstra deixam o acesso direto do backend de lado e consultam
+os métodos do grafo (ver algoritmos), então os tempos medidos são maiores.
+
+instrumentar(grafo, cprofile=True) liga também um cProfile.Profile durante o
+bloco: perfil.pstats() devolve um pstats.Stats, perfil.salvar_pstats(arquivo)
+grava no formato do cProfile (snakeviz, pstats, etc.).
+"""
+import cProfile
+import functools
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Optional
+
+_NULO = nullcontext()
+
+
+class Perfil:
+    """Contadores e tempos por fase de uma sessão de instrumentar()."""
+
+    def __init__(self, cprofile: bool = False):
+        self.contadores: Dict[str, int] = {}
+        self.fases: Dict[str, float] = {}
+        self.chamadas: Dict[str, int] = {}
+        self.tempo_total = 0.0
+        self._profiler: Optional[cProfile.Profile] = cProfile.Profile() if cprofile else None
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    @contextmanager
+    def fase(self, nome: str):
+        ini = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.fases[nome] = self.fases.get(nome, 0.0) + time.perf_counter() - ini
+            self.chamadas[nome] = self.chamadas.get(nome, 0) + 1
+
+    def contando(self, funcao: Callable, *nomes: str, sucesso: Optional[str] = None) -> Callable:
+        """funcao que soma 1 em cada nome a cada chamada (e em `sucesso` se devolver algo verdadeiro)."""
+        contadores = self.contadores
+        for nome in nomes + ((sucesso,) if sucesso else ()):
+            contadores.setdefault(nome, 0)
+
+        def contada(*args):
+            for nome in nomes:
+                contadores[nome] += 1
+            resultado = funcao(*args)
+            if sucesso and resultado:
+                contadores[sucesso] += 1
+            return resultado
+        return contada
+
+    def como_dict(self) -> Dict[str, object]:
+        return {
+            "contadores": dict(self.contadores),
+            "fases": {nome: {"tempo": t, "chamadas": self.chamadas[nome]}
+                      for nome, t in self.fases.items()},
+            "tempo_total": self.tempo_total,
+        }
+
+    def pstats(self) -> pstats.Stats:
+        if self._profiler is None:
+            raise ValueError("Perfil criado sem cprofile=True")
+        return pstats.Stats(self._profiler)
+
+    def salvar_pstats(self, caminho: str) -> None:
+        self.pstats().dump_stats(caminho)
+
+
+def perfil_de(grafo) -> Optional[Perfil]:
+    """Perfil ativo no grafo (None fora de instrumentar)."""
+    return getattr(grafo, "_perfil", None)
+
+
+def fase(grafo, nome: str):
+    """Context manager que cronometra `nome` se o grafo estiver instrumentado."""
+    perfil = getattr(grafo, "_perfil", None)
+    return _NULO if perfil is None else perfil.fase(nome)
+
+
+def instrumentado(nome: str):
+    """Decorador para algoritmos cujo 1º argumento é o grafo (ou self)."""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(grafo, *args, **kwargs):
+            perfil = getattr(grafo, "_perfil", None)
+            if perfil is None:
+                return funcao(grafo, *args, **kwargs)
+            with perfil.fase(nome):
+                return funcao(grafo, *args, **kwargs)
+        return envolvida
+    return decorador
+
+
+def _consultas_contadas(grafo, perfil: Perfil) -> Dict[str, Callable]:
+    contadores = perfil.contadores
+    for nome in ("vizinhos", "vizinhos_arestas", "peso_aresta", "existe_aresta"):
+        contadores.setdefault(nome, 0)
+    retornar_vizinhos = grafo.retornar_vizinhos
+    vizinhos_com_peso = grafo.vizinhos_com_peso
+
+    def vizinhos(vertice):
+        r = retornar_vizinhos(vertice)
+        contadores["vizinhos"] += 1
+        contadores["vizinhos_arestas"] += len(r)
+        return r
+
+    def vizinhos_pesos(vertice):
+        r = vizinhos_com_peso(vertice)
+        contadores["vizinhos"] += 1
+        contadores["vizinhos_arestas"] += len(r)
+        return r
+
+    return {
+        "retornar_vizinhos": vizinhos,
+        "vizinhos_com_peso": vizinhos_pesos,
+        "peso_aresta": perfil.contando(grafo.peso_aresta, "peso_aresta"),
+        "existe_aresta": perfil.contando(grafo.existe_aresta, "existe_aresta"),
+    }
+
+
+@contextmanager
+def instrumentar(grafo, cprofile: bool = False):
+    """Liga a instrumentação no grafo durante o bloco; devolve o Perfil."""
+    if getattr(grafo, "_perfil", None) is not None:
+        raise RuntimeError("Grafo já está sendo instrumentado")
+    perfil = Perfil(cprofile)
+    sombras = _consultas_contadas(grafo, perfil)
+    grafo.__dict__.update(sombras)
+    grafo._perfil = perfil
+    if perfil._profiler is not None:
+        perfil._profiler.enable()
+    ini = time.perf_counter()
+    try:
+        yield perfil
+    finally:
+        perfil.tempo_total += time.perf_counter() - ini
+        if perfil._profiler is not None:
+            perfil._profiler.disable()
+        for nome in sombras:
+            grafo.__dict__.pop(nome, None)
+        grafo._perfil = None
+
+
+def perfilar(funcao: Callable, grafo, *args, cprofile: bool = False, **kwargs):
+    """Atalho: (resultado, Perfil) de uma chamada funcao(grafo, ...) instrumentada."""
+    with instrumentar(grafo, cprofile) as perfil:
+        resultado = funcao(grafo, *args, **kwargs)
+    return resultado, perfil
@@ -1,46 +1,111 @@
 # leitor_arquivos.py
+import logging
+import mmap
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+import numpy as np
 from grafo_matriz import GrafoMatriz
 from grafo_lista import GrafoLista
+from grafo_csr import GrafoCSR, csr_de_arestas
+from cache_grafo import carregar_cache, salvar_cache
 
-def ler_arquivo(caminho: str, representacao: str = "lista"):
-    try:
-        with open(caminho, 'r', encoding='utf-8') as f:
-            linhas_brutas = f.readlines()
-    except FileNotFoundError:
-        print(f"❌ Arquivo {caminho} não encontrado!")
-        return None
-    except Exception as e:
-        print(f"❌ Erro ao abrir {caminho}: {e}")
-        return None
+# Mensagens de carga vão para este logger, mudo por padrão: quem quiser ver
+# chama logging.basicConfig (main.py e algoritmo_coloracao.py fazem isso).
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
-    linhas = []
-    for l in linhas_brutas:
-        l = l.strip()
-        if not l or l.startswith("#") or l.startswith("//"):
-            continue
-        linhas.append(l)
+REPRESENTACOES = {"lista": GrafoLista, "matriz": GrafoMatriz, "csr": GrafoCSR}
+
+# Arquivos a partir deste tamanho são lidos por mmap em vez de f.read()
+LIMIAR_MMAP = 64 * 1024 * 1024
+# Tamanho (bytes) de cada bloco entregue ao parser vetorizado
+TAMANHO_BLOCO = 16 * 1024 * 1024
 
-    if not linhas:
-        print(f"⚠️ Arquivo {caminho} está vazio (após filtrar comentários).")
-        return None
 
-    header = linhas[0].split()
-    if len(header) < 4:
-        print(f"❌ Formato do header inválido em {caminho}: {linhas[0]!r}")
+def _eh_comentario(linha: bytes) -> bool:
+    return not linha or linha.startswith(b"#") or linha.startswith(b"//")
+
+
+def _ler_cabecalho(dados):
+    """Acha a primeira linha útil. Retorna (campos, offset logo após ela) ou (None, fim)."""
+    pos = 0
+    fim = len(dados)
+    while pos < fim:
+        quebra = dados.find(b"\n", pos)
+        prox = fim if quebra == -1 else quebra + 1
+        linha = dados[pos:prox].strip()
+        if not _eh_comentario(linha):
+            return linha.decode("utf-8", errors="replace").split(), prox
+        pos = prox
+    return None, fim
+
+
+def _blocos(dados, inicio: int, tamanho: int = TAMANHO_BLOCO):
+    """Fatias de `dados` com ~tamanho bytes, sempre terminando em fim de linha."""
+    fim = len(dados)
+    while inicio < fim:
+        corte = min(inicio + tamanho, fim)
+        if corte < fim:
+            quebra = dados.find(b"\n", corte)
+            corte = fim if quebra == -1 else quebra + 1
+        yield dados[inicio:corte]
+        inicio = corte
+
+
+def _parse_bloco_vetorizado(bloco: bytes, ponderado: bool):
+    """
+    Caminho rápido: todas as linhas do bloco com 2 ou 3 campos numéricos,
+    vértices escritos como inteiros. Retorna (u, v, w) ou None quando o bloco
+    precisa do parser linha a linha (que tem a palavra final sobre cada linha).
+    """
+    if b"#" in bloco or b"//" in bloco:
         return None
+    b = np.frombuffer(bloco, dtype=np.uint8)
+    espaco = b <= 32
+    inicio = ~espaco
+    inicio[1:] &= espaco[:-1]
+    pos_tokens = np.flatnonzero(inicio)
+    if len(pos_tokens) == 0:
+        vazio = np.empty(0, dtype=np.int64)
+        return vazio, vazio, np.empty(0, dtype=np.float64)
 
+    campos = np.bincount(np.searchsorted(np.flatnonzero(b == 10), pos_tokens))
+    campos = campos[campos > 0]
+    k = int(campos[0])
+    if k not in (2, 3) or np.any(campos != k):
+        return None
+    # "1.0"/"1e0" viram inteiro no float64, mas int() do parser linha a linha
+    # recusa: '.', 'e' ou 'E' em campo de vértice manda o bloco para lá
+    suspeitos = np.flatnonzero((b == 46) | (b == 101) | (b == 69))
+    if len(suspeitos) and np.any((np.searchsorted(pos_tokens, suspeitos, side="right") - 1) % k < 2):
+        return None
     try:
-        V, A, D, P = map(int, header[:4])
+        valores = np.fromstring(bloco, dtype=np.float64, sep=" ")
     except ValueError:
-        print(f"❌ Header não numérico em {caminho}: {linhas[0]!r}")
+        return None
+    if len(valores) != len(pos_tokens):
         return None
 
-    grafo = GrafoMatriz(bool(D), bool(P)) if representacao.lower()=="matriz" else GrafoLista(bool(D), bool(P))
-    for i in range(V):
-        grafo.inserir_vertice(str(i))
+    tabela = valores.reshape(-1, k)
+    uv = tabela[:, :2]
+    if not np.all(np.isfinite(uv)) or np.any(uv != np.floor(uv)):
+        return None
+    uv = uv.astype(np.int64)
+    if ponderado and k == 3:
+        w = np.ascontiguousarray(tabela[:, 2])
+    else:
+        w = np.ones(len(tabela), dtype=np.float64)
+    return uv[:, 0].copy(), uv[:, 1].copy(), w
 
-    arestas_raw = []
-    for linha in linhas[:]:
+
+def _parse_bloco_linhas(bloco: bytes, ponderado: bool):
+    """Parser linha a linha (comentários, linhas irregulares, lixo)."""
+    us, vs, ws = [], [], []
+    for linha in bloco.decode("utf-8", errors="replace").splitlines():
+        linha = linha.strip()
+        if not linha or linha.startswith("#") or linha.startswith("//"):
+            continue
         partes = linha.split()
         if len(partes) < 2:
             continue
@@ -49,38 +114,252 @@ def ler_arquivo(caminho: str, representacao: str = "lista"):
         except ValueError:
             continue
         peso = 1.0
-        if P == 1 and len(partes) >= 3:
+        if ponderado and len(partes) >= 3:
             try:
                 peso = float(partes[2])
             except ValueError:
                 peso = 1.0
-        arestas_raw.append((u, v, peso))
+        us.append(u)
+        vs.append(v)
+        ws.append(peso)
+    return (np.array(us, dtype=np.int64), np.array(vs, dtype=np.int64),
+            np.array(ws, dtype=np.float64))
+
 
-    if not arestas_raw:
-        print(f"⚠️ Arquivo {caminho} não contém arestas válidas.")
-        return grafo
+def parse_bloco(bloco: bytes, ponderado: bool):
+    """Converte um bloco de linhas de aresta em arrays (u, v, w)."""
+    r = _parse_bloco_vetorizado(bloco, ponderado)
+    return r if r is not None else _parse_bloco_linhas(bloco, ponderado)
+
+
+def _abrir_dados(f, tamanho: int, forcar_mmap: bool = False):
+    if not tamanho:
+        return b""
+    if forcar_mmap or tamanho >= LIMIAR_MMAP:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return f.read()
+
+
+def _varrer(caminho: str, tamanho_bloco: int = TAMANHO_BLOCO, forcar_mmap: bool = False):
+    """
+    Gerador: primeiro (V, A, D, P), depois um (u, v, w) por bloco do arquivo.
+    Lança FileNotFoundError/OSError na abertura, EOFError se não houver header
+    e ValueError para header inválido.
+    """
+    with open(caminho, "rb") as f:
+        dados = _abrir_dados(f, os.fstat(f.fileno()).st_size, forcar_mmap)
+        try:
+            header, inicio = _ler_cabecalho(dados)
+            if header is None:
+                raise EOFError(caminho)
+            if len(header) < 4:
+                raise ValueError(f"Formato do header inválido em {caminho}: {' '.join(header)!r}")
+            try:
+                V, A, D, P = map(int, header[:4])
+            except ValueError:
+                raise ValueError(f"Header não numérico em {caminho}: {' '.join(header)!r}")
+            yield V, A, D, P
+            for bloco in _blocos(dados, inicio, tamanho_bloco):
+                yield parse_bloco(bloco, P == 1)
+        finally:
+            if isinstance(dados, mmap.mmap):
+                dados.close()
 
-    todos_idx = [x for (u, v, _) in arestas_raw for x in (u, v)]
-    contem_zero = any(idx == 0 for idx in todos_idx)
-    contem_V = any(idx == V for idx in todos_idx)
-    one_based = (not contem_zero) and contem_V
 
-    if one_based:
-        arestas = [(u-1, v-1, w) for (u, v, w) in arestas_raw]
-        print(f"ℹ️ {caminho}: índices 1-based detectados → normalizado para 0-based.")
+def ler_arestas_arrays(caminho: str, tempos: Optional[Dict[str, float]] = None):
+    """
+    Lê o arquivo inteiro para arrays NumPy em uma passada.
+    Retorna ((V, A, D, P), u, v, w) com índices ainda como estão no arquivo.
+    `tempos`, se dado, recebe "leitura" (abrir/ler + header) e "parse"; com
+    mmap a leitura das páginas acontece durante o parse.
+    """
+    ini = time.perf_counter()
+    varredura = _varrer(caminho)
+    cabecalho = next(varredura)
+    lido = time.perf_counter()
+    partes = list(varredura)
+    if partes:
+        u = np.concatenate([p[0] for p in partes])
+        v = np.concatenate([p[1] for p in partes])
+        w = np.concatenate([p[2] for p in partes])
     else:
-        arestas = arestas_raw
+        u = v = np.empty(0, dtype=np.int64)
+        w = np.empty(0, dtype=np.float64)
+    if tempos is not None:
+        tempos["leitura"] = lido - ini
+        tempos["parse"] = time.perf_counter() - lido
+    return cabecalho, u, v, w
 
-    rejeitadas = 0
-    inseridas = 0
-    for (u, v, w) in arestas:
-        if u < 0 or v < 0 or u >= V or v >= V:
-            rejeitadas += 1
+
+def ler_cabecalho(caminho: str):
+    """(V, A, D, P) do arquivo, sem ler as arestas."""
+    varredura = _varrer(caminho, forcar_mmap=True)
+    try:
+        return next(varredura)
+    finally:
+        varredura.close()
+
+
+def _blocos_do_lote(tamanho_lote: int) -> int:
+    # ~16 bytes por linha de aresta: blocos da ordem de um lote
+    return max(1 << 16, 16 * tamanho_lote)
+
+
+def detectar_base_em_lotes(caminho: str, tamanho_lote: int = 1_000_000) -> int:
+    """detectar_base em streaming (uma passada, memória limitada ao bloco)."""
+    varredura = _varrer(caminho, _blocos_do_lote(tamanho_lote), forcar_mmap=True)
+    V = next(varredura)[0]
+    menor, maior, vazio = None, None, True
+    for u, v, _ in varredura:
+        if len(u) == 0:
+            continue
+        lo = min(int(u.min()), int(v.min()))
+        hi = max(int(u.max()), int(v.max()))
+        menor = lo if vazio else min(menor, lo)
+        maior = hi if vazio else max(maior, hi)
+        vazio = False
+    return 0 if vazio else int(menor >= 1 and maior <= V)
+
+
+def ler_arestas_em_lotes(caminho: str, tamanho_lote: int = 1_000_000, base: Optional[int] = None):
+    """
+    Gerador de lotes (u, v, w) com no máximo `tamanho_lote` arestas cada,
+    já em 0-based e sem arestas fora de [0, V). O arquivo é mapeado (mmap) e
+    nunca é carregado inteiro: o pico de memória é proporcional ao lote.
+
+    base=None detecta 1-based com uma passada extra (detectar_base_em_lotes).
+    Arestas repetidas NÃO são deduplicadas (isso exigiria memória O(E)).
+    """
+    if tamanho_lote <= 0:
+        raise ValueError("tamanho_lote deve ser positivo")
+    if base is None:
+        base = detectar_base_em_lotes(caminho, tamanho_lote)
+    varredura = _varrer(caminho, _blocos_do_lote(tamanho_lote), forcar_mmap=True)
+    V = next(varredura)[0]
+
+    pendentes, n_pendentes = [], 0
+    for u, v, w in varredura:
+        if base:
+            u = u - 1
+            v = v - 1
+        validas = (u >= 0) & (v >= 0) & (u < V) & (v < V)
+        if not validas.all():
+            u, v, w = u[validas], v[validas], w[validas]
+        if len(u) == 0:
             continue
-        if grafo.inserir_aresta(u, v, w):
-            inseridas += 1
-        else:
-            rejeitadas += 1
+        pendentes.append((u, v, w))
+        n_pendentes += len(u)
+        if n_pendentes < tamanho_lote:
+            continue
+        u = np.concatenate([p[0] for p in pendentes])
+        v = np.concatenate([p[1] for p in pendentes])
+        w = np.concatenate([p[2] for p in pendentes])
+        ini = 0
+        while len(u) - ini >= tamanho_lote:
+            yield u[ini:ini + tamanho_lote], v[ini:ini + tamanho_lote], w[ini:ini + tamanho_lote]
+            ini += tamanho_lote
+        # cópia: a sobra não deve segurar o buffer concatenado inteiro
+        pendentes = [(u[ini:].copy(), v[ini:].copy(), w[ini:].copy())] if ini < len(u) else []
+        n_pendentes = len(u) - ini
+    if n_pendentes:
+        yield (np.concatenate([p[0] for p in pendentes]),
+               np.concatenate([p[1] for p in pendentes]),
+               np.concatenate([p[2] for p in pendentes]))
+
+
+def detectar_base(V: int, u: np.ndarray, v: np.ndarray) -> int:
+    """1 se os índices parecem 1-based (nenhum 0 e nenhum acima de V), senão 0."""
+    if len(u) == 0:
+        return 0
+    menor = min(int(u.min()), int(v.min()))
+    maior = max(int(u.max()), int(v.max()))
+    return 1 if menor >= 1 and maior <= V else 0
+
+
+class EstatisticasCarga(NamedTuple):
+    """Resumo de uma chamada a ler_arquivo(..., estatisticas=True)."""
+    caminho: str
+    vertices: int
+    arestas_lidas: int
+    arestas_inseridas: int
+    arestas_rejeitadas: int
+    base_1: bool                 # índices 1-based detectados e normalizados
+    do_cache: bool               # veio do snapshot .grafobin
+    tempos: Dict[str, float]     # segundos: leitura, parse, normalizacao, insercao
+
+
+def _informar_carga(caminho: str, V: int, base: int, lidas: int, rejeitadas: int) -> None:
+    if lidas == 0:
+        logger.warning("⚠️ Arquivo %s não contém arestas válidas.", caminho)
+        return
+    if base == 1:
+        logger.info("ℹ️ %s: índices 1-based detectados → normalizado para 0-based.", caminho)
+    logger.info("ℹ️ %s: vértices=%d, arestas_lidas=%d, arestas_inseridas=%d, rejeitadas=%d",
+                caminho, V, lidas, lidas - rejeitadas, rejeitadas)
+
+
+def ler_arquivo(caminho: str, representacao: str = "lista", usar_cache: bool = True,
+                estatisticas: bool = False):
+    """
+    Lê o arquivo (V A D P + arestas) e devolve GrafoLista, GrafoMatriz ou GrafoCSR.
+    Com usar_cache=True reaproveita/grava o snapshot binário "<caminho>.grafobin"
+    (ver cache_grafo); para representacao="csr" os arrays vêm mapeados do disco.
+    estatisticas=True devolve (grafo, EstatisticasCarga); em erro, (None, None).
+    Mensagens saem pelo logger do módulo (nada é impresso por padrão).
+    """
+    classe = REPRESENTACOES.get(representacao.lower(), GrafoLista)
+    tempos = {"leitura": 0.0, "parse": 0.0, "normalizacao": 0.0, "insercao": 0.0}
+
+    def concluir(grafo, V, base, lidas, rejeitadas, do_cache):
+        _informar_carga(caminho, V, base, lidas, rejeitadas)
+        if not estatisticas:
+            return grafo
+        return grafo, EstatisticasCarga(caminho, V, lidas, lidas - rejeitadas, rejeitadas,
+                                        base == 1, do_cache, tempos)
+
+    if usar_cache:
+        ini = time.perf_counter()
+        snap = carregar_cache(caminho)
+        tempos["leitura"] = time.perf_counter() - ini
+        if snap is not None:
+            ini = time.perf_counter()
+            grafo = classe.de_csr(bool(snap.D), bool(snap.P), snap.indptr, snap.indices, snap.pesos)
+            tempos["insercao"] = time.perf_counter() - ini
+            return concluir(grafo, snap.V, snap.base, snap.lidas, snap.rejeitadas, True)
+
+    falha = (None, None) if estatisticas else None
+    try:
+        (V, A, D, P), u, v, w = ler_arestas_arrays(caminho, tempos)
+    except FileNotFoundError:
+        logger.error("❌ Arquivo %s não encontrado!", caminho)
+        return falha
+    except EOFError:
+        logger.warning("⚠️ Arquivo %s está vazio (após filtrar comentários).", caminho)
+        return falha
+    except ValueError as e:
+        logger.error("❌ %s", e)
+        return falha
+    except Exception as e:
+        logger.error("❌ Erro ao abrir %s: %s", caminho, e)
+        return falha
+
+    ini = time.perf_counter()
+    base = detectar_base(V, u, v)
+    if base == 1:
+        u = u - 1
+        v = v - 1
+
+    validas = (u >= 0) & (v >= 0) & (u < V) & (v < V)
+    lidas = len(u)
+    rejeitadas = lidas - int(np.count_nonzero(validas))
+    if rejeitadas:
+        u, v, w = u[validas], v[validas], w[validas]
+    tempos["normalizacao"] = time.perf_counter() - ini
 
-    print(f"ℹ️ {caminho}: vértices={V}, arestas_lidas={len(arestas_raw)}, arestas_inseridas={inseridas}, rejeitadas={rejeitadas}")
-    return grafo
+    ini = time.perf_counter()
+    indptr, indices, pesos = csr_de_arestas(V, u, v, w if P == 1 else None, bool(D))
+    if usar_cache:
+        salvar_cache(caminho, V, A, D, P, base, lidas, rejeitadas, indptr, indices, pesos)
+    grafo = classe.de_csr(bool(D), bool(P), indptr, indices, pesos)
+    tempos["insercao"] = time.perf_counter() - ini
+    return concluir(grafo, V, base, lidas, rejeitadas, False)
@@ -1,6 +1,8 @@
 # main.py
 import os
 import glob
+import logging
+import sys
 from leitor_arquivos import ler_arquivo  # mantém leitor
 
 def find_file(base_name):
@@ -19,6 +21,7 @@ def find_file(base_name):
     return None
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     arquivos_base = ["espacoaereo", "slides", "slides_modificado"]
 
     for base in arquivos_base:
@@ -44,8 +47,8 @@ if __name__ == "__main__":
         print("DFS (primeiros 20):", ordem_dfs[:20])
 
         if grafo.ponderado:
-            distancias, caminhos = grafo.dijkstra(0)
-            print("Dijkstra (distâncias, primeiros 10):", distancias[:10], "...")
+            resultado = grafo.dijkstra(0)
+            print("Dijkstra (distâncias, primeiros 10):", resultado.distancias[:10], "...")
             if 5 < len(grafo.vertices):
-                print("Caminho até 5:", caminhos.get(5, []))
+                print("Caminho até 5:", resultado.caminho_ate(5))
 
@@ -0,0 +1,299 @@
+# portfolio_coloracao.py
+"""
+Portfólio de coloração: as heurísticas de algoritmo_coloracao e dois
+melhoradores (gulosa iterada com reinícios aleatórios e busca tabu) rodando
+ao mesmo tempo em um ProcessPoolExecutor, com um orçamento de tempo de parede.
+
+A adjacência não-direcionada é montada uma vez e vai para cada worker no
+initializer (um pickle por processo, não por tarefa). Toda coloração que volta
+é validada; o resultado é a melhor válida que chegou até o prazo. Se alguma
+bater o limite inferior (clique gulosa) ou a coloração exata provar o ótimo,
+o portfólio termina antes.
+
+Os melhoradores rodam até o prazo da sua "onda": com P processos e L tarefas
+longas, elas são divididas em ceil(L/P) janelas iguais do orçamento. Quando o
+portfólio termina antes, um multiprocessing.Event compartilhado (entregue no
+initializer) avisa as tarefas em andamento para pararem.
+"""
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from algoritmo_coloracao import (build_undirected_adj, clique_gulosa, coloracao_exata_adj,
+                                 dsatur_adj, greedy_by_order, is_valid_coloring)
+
+# Adjacência e sinal de parada do worker (preenchidos por _iniciar_worker)
+_ADJ: List[Set[int]] = []
+_PARAR: list = [None]
+
+
+class ResultadoPortfolio(NamedTuple):
+    coloracao: List[int]
+    cores: int
+    metodo: str                  # quem achou a melhor
+    limite_inferior: int
+    otimo: bool                  # provado (clique = cores ou exata terminou)
+    cores_por_metodo: Dict[str, int]
+
+
+# --- Melhoradores ---
+def gulosa_iterada(adj: List[Set[int]], prazo: float, semente: int = 0,
+                   coloracao: Optional[List[int]] = None, parar=None) -> Tuple[List[int], int]:
+    """
+    Gulosa iterada (Culberson): recolore na ordem das classes de cor da
+    melhor solução (classes inteiras, em ordem invertida, aleatória ou por
+    tamanho), o que nunca aumenta o número de cores. Sem melhora por um tempo,
+    reinicia de uma ordem aleatória. `prazo` é um time.time() absoluto;
+    `parar` (Event) encerra antes.
+    """
+    rng = random.Random(semente)
+    n = len(adj)
+    if coloracao is None:
+        ordem = list(range(n))
+        rng.shuffle(ordem)
+        coloracao, _ = greedy_by_order(adj, ordem)
+    atual = coloracao
+    melhor, k_melhor = list(atual), max(atual) + 1 if n else 0
+    sem_melhora = 0
+    while time.time() < prazo and k_melhor > 1 and not (parar is not None and parar.is_set()):
+        classes: Dict[int, List[int]] = {}
+        for v, c in enumerate(atual):
+            classes.setdefault(c, []).append(v)
+        grupos = list(classes.values())
+        sorteio = rng.random()
+        if sorteio < 0.5:
+            grupos.reverse()
+        elif sorteio < 0.8:
+            rng.shuffle(grupos)
+        else:
+            grupos.sort(key=len, reverse=True)
+        atual, k = greedy_by_order(adj, [v for g in grupos for v in g])
+        if k < k_melhor:
+            melhor, k_melhor, sem_melhora = list(atual), k, 0
+        else:
+            sem_melhora += 1
+        if sem_melhora > 1000:
+            ordem = list(range(n))
+            rng.shuffle(ordem)
+            atual, _ = greedy_by_order(adj, ordem)
+            sem_melhora = 0
+    return melhor, k_melhor
+
+
+def _tabucol(vizinhos: List[List[int]], cor: List[int], k: int, prazo: float,
+             rng: random.Random, parar=None) -> Optional[List[int]]:
+    """TabuCol: minimiza conflitos com k cores. None se o prazo acabar (ou `parar` ligar) antes."""
+    n = len(vizinhos)
+    gama = [[0] * k for _ in range(n)]  # gama[v][c]: vizinhos de v com cor c
+    for v in range(n):
+        gv = gama[v]
+        for w in vizinhos[v]:
+            gv[cor[w]] += 1
+    conflitos = sum(gama[v][cor[v]] for v in range(n)) // 2
+    tabu = [[0] * k for _ in range(n)]  # iteração até a qual (v, c) é proibido
+    it = 0
+    while conflitos > 0:
+        if it % 256 == 0 and (time.time() > prazo or (parar is not None and parar.is_set())):
+            return None
+        melhor_delta = math.inf
+        movimentos: List[Tuple[int, int]] = []
+        em_conflito = 0
+        for v in range(n):
+            gv = gama[v]
+            cv = cor[v]
+            base = gv[cv]
+            if base == 0:
+                continue
+            em_conflito += 1
+            tv = tabu[v]
+            for c in range(k):
+                if c == cv:
+                    continue
+                delta = gv[c] - base
+                # aspiração: movimento tabu vale se zera os conflitos
+                if tv[c] > it and conflitos + delta > 0:
+                    continue
+                if delta < melhor_delta:
+                    melhor_delta, movimentos = delta, [(v, c)]
+                elif delta == melhor_delta:
+                    movimentos.append((v, c))
+        it += 1
+        if not movimentos:
+            continue
+        v, c = rng.choice(movimentos)
+        antiga = cor[v]
+        cor[v] = c
+        for w in vizinhos[v]:
+            gama[w][antiga] -= 1
+            gama[w][c] += 1
+        conflitos += melhor_delta
+        tabu[v][antiga] = it + int(0.6 * em_conflito) + rng.randrange(10)
+    return cor
+
+
+def busca_tabu(adj: List[Set[int]], prazo: float, semente: int = 0,
+               coloracao: Optional[List[int]] = None, parar=None) -> Tuple[List[int], int]:
+    """
+    Parte de uma coloração válida (DSATUR se nenhuma for dada) e tenta k-1
+    cores: a última classe é espalhada ao acaso e a TabuCol tira os
+    conflitos. Repete enquanto conseguir e houver tempo.
+    """
+    rng = random.Random(semente)
+    if coloracao is None:
+        coloracao, _ = dsatur_adj(adj)
+    vizinhos = [list(a) for a in adj]
+    melhor = list(coloracao)
+    k = max(melhor) + 1 if melhor else 0
+    while k > 1 and time.time() < prazo:
+        tentativa = [c if c < k - 1 else rng.randrange(k - 1) for c in melhor]
+        resultado = _tabucol(vizinhos, tentativa, k - 1, prazo, rng, parar)
+        if resultado is None:
+            break
+        melhor, k = resultado, k - 1
+    return melhor, k
+
+
+# --- Tarefas ---
+def _welsh_powell(adj, prazo, semente):
+    ordem = sorted(range(len(adj)), key=lambda v: -len(adj[v]))
+    return greedy_by_order(adj, ordem)
+
+
+def _simples(adj, prazo, semente):
+    return greedy_by_order(adj, list(range(len(adj))))
+
+
+def _dsatur(adj, prazo, semente):
+    return dsatur_adj(adj)
+
+
+def _exata(adj, prazo, semente):
+    r = coloracao_exata_adj(adj, max(0.0, prazo - time.time()), _PARAR[0])
+    return r.coloracao, r.cores, r.otimo
+
+
+_TAREFAS = {
+    "Heurística Simples": _simples,
+    "Welsh-Powell": _welsh_powell,
+    "DSATUR": _dsatur,
+    "Exata": _exata,
+    "Gulosa iterada": lambda adj, prazo, semente: gulosa_iterada(adj, prazo, semente,
+                                                                 parar=_PARAR[0]),
+    "Tabu": lambda adj, prazo, semente: busca_tabu(adj, prazo, semente, parar=_PARAR[0]),
+}
+_RAPIDAS = ("Heurística Simples", "Welsh-Powell", "DSATUR")
+
+
+def _iniciar_worker(adj, parar=None) -> None:
+    _ADJ[:] = adj
+    _PARAR[0] = parar
+
+
+def _executar(metodo: str, prazo: float, semente: int):
+    r = _TAREFAS[metodo](_ADJ, prazo, semente)
+    otimo = len(r) > 2 and r[2]
+    return metodo, r[0], r[1], otimo
+
+
+def _plano(processos: int, exata: bool, orcamento: float, inicio: float,
+           semente: int) -> List[Tuple[str, float, int]]:
+    """(método, prazo, semente) de cada tarefa, na ordem de submissão."""
+    longas = (["Exata"] if exata else []) + ["Tabu", "Gulosa iterada"]
+    # sobra de processos vira mais sementes dos melhoradores
+    s = 1
+    while len(longas) < processos:
+        longas.append("Tabu" if s % 2 else "Gulosa iterada")
+        s += 1
+    ondas = math.ceil(len(longas) / processos)
+    # as tarefas param um pouco antes, para o resultado chegar dentro do prazo
+    orcamento -= min(0.1 * orcamento, 0.5)
+    janela = orcamento / ondas
+    plano = [(m, inicio + orcamento, semente) for m in _RAPIDAS]
+    plano += [(m, inicio + (j // processos + 1) * janela, semente + j)
+              for j, m in enumerate(longas)]
+    return plano
+
+
+def colorir_portfolio(grafo, orcamento: float = 5.0, processos: Optional[int] = None,
+                      semente: int = 0, exata: bool = True) -> ResultadoPortfolio:
+    """
+    Melhor coloração válida achada em `orcamento` segundos de parede.
+    processos=1 roda tudo no próprio processo, em sequência.
+    """
+    inicio = time.time()
+    prazo = inicio + orcamento
+    adj = build_undirected_adj(grafo)
+    n = len(adj)
+    if n == 0:
+        return ResultadoPortfolio([], 0, "", 0, True, {})
+    lb = len(clique_gulosa(adj))
+    processos = processos or os.cpu_count() or 1
+    plano = _plano(processos, exata, orcamento, inicio, semente)
+
+    melhor: Tuple[List[int], int, str] = ([0] * n, n + 1, "")
+    cores_por_metodo: Dict[str, int] = {}
+    otimo = False
+
+    def registrar(metodo, coloracao, k, provado) -> bool:
+        """Guarda se for válida e melhor; True se já não dá para melhorar."""
+        nonlocal melhor, otimo
+        if not is_valid_coloring(grafo, coloracao):
+            return False
+        cores_por_metodo[metodo] = min(k, cores_por_metodo.get(metodo, k))
+        if k < melhor[1]:
+            melhor = (list(coloracao), k, metodo)
+        otimo = otimo or provado or melhor[1] <= lb
+        return otimo
+
+    if processos == 1:
+        _iniciar_worker(adj)
+        for metodo, prazo_tarefa, s in plano:
+            if time.time() >= prazo:
+                break
+            if registrar(*_executar(metodo, prazo_tarefa, s)):
+                break
+    else:
+        parar = multiprocessing.Event()
+        executor = ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_worker,
+                                       initargs=(adj, parar))
+        try:
+            pendentes = {executor.submit(_executar, m, p, s) for m, p, s in plano}
+            while pendentes:
+                feitos, pendentes = wait(pendentes, timeout=max(0.0, prazo - time.time()),
+                                         return_when=FIRST_COMPLETED)
+                if not feitos or any(registrar(*f.result()) for f in feitos):
+                    break
+        finally:
+            # tarefas em andamento veem o sinal e param; não esperamos por elas
+            parar.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    coloracao, k, metodo = melhor
+    if not metodo:  # nada voltou a tempo: todo vértice com sua cor
+        coloracao, k = list(range(n)), n
+    return ResultadoPortfolio(coloracao, k, metodo, lb, otimo, cores_por_metodo)
+
+
+if __name__ == "__main__":
+    # Compara o portfólio com a soma das heurísticas em sequência
+    import logging
+    import sys
+    from leitor_arquivos import ler_arquivo
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else "espacoaereo.txt"
+    orcamento = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    grafo = ler_arquivo(arquivo, representacao="lista")
+    if grafo is None:
+        sys.exit(1)
+    ini = time.perf_counter()
+    r = colorir_portfolio(grafo, orcamento)
+    tempo = time.perf_counter() - ini
+    print(f"{arquivo}: {r.cores} cores ({r.metodo}), limite inferior {r.limite_inferior}, "
+          f"ótimo={r.otimo}, {tempo:.2f}s")
+    for metodo, k in sorted(r.cores_por_metodo.items(), key=lambda x: x[1]):
+        print(f"   {metodo:<20} {k}")
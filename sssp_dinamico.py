@@ -0,0 +1,283 @@
+# sssp_dinamico.py
+"""
+Caminhos mínimos de origem única mantidos sob alterações de aresta, no
+estilo de Ramalingam–Reps: em vez de rodar o Dijkstra de novo a cada
+inserir_aresta/remover_aresta, só a parte afetada da árvore é refeita.
+
+  - peso diminuiu / aresta nova: Dijkstra a partir da ponta da aresta,
+    espalhando só enquanto as distâncias melhoram;
+  - peso aumentou / aresta removida (só importa se for aresta da árvore):
+    fase 1 acha os vértices afetados, em ordem de distância antiga, que não
+    têm outro predecessor com a mesma distância (outra aresta do DAG de
+    caminhos mínimos); fase 2 recalcula só esses, partindo dos vizinhos não
+    afetados, com um Dijkstra restrito a eles.
+
+As alterações passam por esta estrutura (alterar_aresta/remover_aresta), que
+as aplica no grafo e num espelho da adjacência (dicts de saída e de entrada),
+então o custo é proporcional à região afetada. Se o grafo mudar por fora
+(Grafo.versao diferente), tudo é recalculado na próxima consulta.
+"""
+import math
+from heapq import heappop, heappush
+from typing import Dict, Iterable, List, Set, Union
+from algoritmos import dijkstra_heap, normalizar_origens
+
+
+class SSSPDinamico:
+    """Distâncias e predecessores de cada origem acompanhada, sempre em dia com o grafo."""
+
+    def __init__(self, grafo, origens: Union[int, Iterable[int]] = 0):
+        if not grafo.ponderado:
+            raise ValueError("SSSP dinâmico precisa de grafo ponderado")
+        self.grafo = grafo
+        self.origens: List[int] = normalizar_origens(origens, len(grafo.vertices)).tolist()
+        self.vertices_tocados = 0  # vértices reexaminados na última alteração (todas as origens)
+        self.recalcular()
+
+    # --- Estado ---
+    def recalcular(self) -> None:
+        """Refaz espelho e árvores do zero (Dijkstra completo por origem)."""
+        csr = self.grafo.freeze()
+        n = len(csr.vertices)
+        ptr, ind = csr.indptr.tolist(), csr.indices.tolist()
+        pesos = csr.pesos.tolist() if csr.pesos is not None else [1.0] * len(ind)
+        self._saida: List[Dict[int, float]] = [dict(zip(ind[ptr[u]:ptr[u + 1]], pesos[ptr[u]:ptr[u + 1]]))
+                                               for u in range(n)]
+        if self.grafo.direcionado:
+            self._entrada: List[Dict[int, float]] = [{} for _ in range(n)]
+            for u, saida in enumerate(self._saida):
+                for v, w in saida.items():
+                    self._entrada[v][u] = w
+        else:
+            self._entrada = self._saida
+        saida = self._saida
+        self._dist: Dict[int, List[float]] = {}
+        self._pred: Dict[int, List[int]] = {}
+        for s in self.origens:
+            self._dist[s], self._pred[s] = dijkstra_heap(n, lambda v: saida[v].items(), s)
+        self._versao = self.grafo.versao
+
+    def _em_dia(self) -> None:
+        if self.grafo.versao != self._versao:
+            self.recalcular()
+
+    def distancias(self, origem: int) -> List[float]:
+        """Distâncias a partir de `origem` (inf = inalcançável). Não modificar."""
+        self._em_dia()
+        return self._dist[origem]
+
+    def resultado(self, origem: int):
+        """Mesmo formato de Grafo.dijkstra (None = inalcançável)."""
+        self._em_dia()
+        return self.grafo._resultado_dijkstra(self._dist[origem], self._pred[origem])
+
+    # --- Alterações ---
+    def alterar_aresta(self, origem: int, destino: int, peso: float) -> bool:
+        """inserir_aresta no grafo (nova ou sobrescrevendo o peso) e reparo das árvores."""
+        self._em_dia()
+        if not self.grafo.inserir_aresta(origem, destino, peso):
+            return False
+        self._sincronizar(origem, destino)
+        return True
+
+    def remover_aresta(self, origem: int, destino: int) -> bool:
+        """remover_aresta no grafo e reparo das árvores."""
+        self._em_dia()
+        if not self.grafo.remover_aresta(origem, destino):
+            return False
+        self._sincronizar(origem, destino)
+        return True
+
+    def _sincronizar(self, u: int, v: int) -> None:
+        """Lê de volta o(s) arco(s) u-v do grafo, atualiza o espelho e repara cada origem."""
+        arcos = [(u, v)] if self.grafo.direcionado or u == v else [(u, v), (v, u)]
+        mudancas = []
+        for a, b in arcos:
+            peso = self.grafo.peso_aresta(a, b)
+            novo = None if peso is None else float(peso)
+            antigo = self._saida[a].get(b)
+            if novo != antigo:
+                mudancas.append((a, b, novo, antigo))
+        # só depois de ler todos: em não-direcionado entrada e saída são os mesmos dicts
+        for a, b, novo, _ in mudancas:
+            if novo is None:
+                self._saida[a].pop(b, None)
+                self._entrada[b].pop(a, None)
+            else:
+                self._saida[a][b] = novo
+                self._entrada[b][a] = novo
+        mudancas = [m for m in mudancas if m[0] != m[1]]
+        self._versao = self.grafo.versao
+        self.vertices_tocados = 0
+        for s in self.origens:
+            dist, pred = self._dist[s], self._pred[s]
+            for a, b, novo, antigo in mudancas:
+                if novo is not None and (antigo is None or novo < antigo):
+                    self.vertices_tocados += self._diminuir(dist, pred, a, b, novo)
+                elif pred[b] == a:
+                    self.vertices_tocados += self._aumentar(dist, pred, b)
+
+    def _diminuir(self, dist: List[float], pred: List[int], u: int, v: int, w: float) -> int:
+        """Arco u->v ficou mais barato: propaga a melhora a partir de v."""
+        nd = dist[u] + w
+        if not nd < dist[v]:
+            return 0
+        dist[v] = nd
+        pred[v] = u
+        saida = self._saida
+        heap = [(nd, v)]
+        tocados = 0
+        while heap:
+            d, x = heappop(heap)
+            if d > dist[x]:
+                continue
+            tocados += 1
+            for y, wy in saida[x].items():
+                nd = d + wy
+                if nd < dist[y]:
+                    dist[y] = nd
+                    pred[y] = x
+                    heappush(heap, (nd, y))
+        return tocados
+
+    def _aumentar(self, dist: List[float], pred: List[int], v: int) -> int:
+        """O arco da árvore que chega em v ficou mais caro ou sumiu."""
+        saida, entrada = self._saida, self._entrada
+        inf = math.inf
+
+        # Fase 1: afetados, em ordem de distância antiga. Um vértice que ainda
+        # tem predecessor não afetado com a mesma distância só troca de pai.
+        # (Arestas de peso 0 não servem de apoio: o apoio precisa ter saído
+        # antes do heap, e com peso 0 as chaves empatam.)
+        afetados: Set[int] = set()
+        heap = [(dist[v], v)]
+        while heap:
+            d, x = heappop(heap)
+            if x in afetados:
+                continue
+            apoio = -1
+            for z, w in entrada[x].items():
+                if w > 0 and z not in afetados and dist[z] + w == d:
+                    apoio = z
+                    break
+            if apoio >= 0:
+                pred[x] = apoio
+                continue
+            afetados.add(x)
+            for y in saida[x]:
+                if pred[y] == x and y not in afetados:
+                    heappush(heap, (dist[y], y))
+
+        # Fase 2: melhor entrada vinda de fora dos afetados, depois Dijkstra
+        # só dentro deles.
+        heap = []
+        for x in afetados:
+            melhor, pai = inf, -1
+            for z, w in entrada[x].items():
+                if z not in afetados and dist[z] + w < melhor:
+                    melhor, pai = dist[z] + w, z
+            dist[x] = melhor
+            pred[x] = pai
+            if melhor < inf:
+                heap.append((melhor, x))
+        heap.sort()  # lista ordenada já é um heap
+        while heap:
+            d, x = heappop(heap)
+            if d > dist[x]:
+                continue
+            for y, wy in saida[x].items():
+                if y in afetados:
+                    nd = d + wy
+                    if nd < dist[y]:
+                        dist[y] = nd
+                        pred[y] = x
+                        heappush(heap, (nd, y))
+        return len(afetados)
+
+
+if __name__ == "__main__":
+    # Confere contra o Dijkstra completo após sequências aleatórias de
+    # alterações e compara o tempo das duas abordagens.
+    import random
+    import sys
+    import time
+    import geradores
+    from grafo_lista import GrafoLista
+    from grafo_matriz import GrafoMatriz
+    from leitor_arquivos import ler_arquivo
+
+    def conferir(din: SSSPDinamico, exato: bool) -> None:
+        g = din.grafo
+        for s in din.origens:
+            esperado = g.dijkstra(s).distancias
+            dist = din.distancias(s)
+            pred = din._pred[s]
+            for v, (a, b) in enumerate(zip(dist, esperado)):
+                b = math.inf if b is None else b
+                assert (a == b) if exato else (a == b or math.isclose(a, b, rel_tol=1e-12)), (s, v, a, b)
+                if v != s and a < math.inf:  # predecessor coerente com a distância
+                    p = pred[v]
+                    assert p >= 0 and dist[p] + din._saida[p][v] == a, (s, v)
+
+    def sequencia(grafo, origens, passos, rng, inteiros: bool) -> None:
+        n = len(grafo.vertices)
+        din = SSSPDinamico(grafo, origens)
+        for _ in range(passos):
+            u = rng.randrange(n)
+            vizinhos = list(din._saida[u])
+            sorteio = rng.random()
+            if vizinhos and sorteio < 0.35:
+                v = rng.choice(vizinhos)
+                w = din._saida[u][v]
+                novo = w * rng.choice((0.5, 2.0, 3.0)) if not inteiros else max(1, int(w) + rng.randint(-5, 10))
+                din.alterar_aresta(u, v, novo)
+            elif vizinhos and sorteio < 0.6:
+                din.remover_aresta(u, rng.choice(vizinhos))
+            else:
+                v = rng.randrange(n)
+                din.alterar_aresta(u, v, rng.randint(1, 100) if inteiros else rng.uniform(0.01, 1.0))
+            conferir(din, inteiros)
+
+    rng = random.Random(7)
+    for direcionado in (False, True):
+        for classe in (GrafoLista, GrafoMatriz):
+            for semente in range(3):
+                gerado = geradores.erdos_renyi(120, 0.04, semente=semente, direcionado=direcionado)
+                sequencia(geradores.construir(gerado, classe), [0, 7, 50], 150, rng, True)
+        gerado = geradores.geometrico(150, 0.15, semente=1, direcionado=direcionado)
+        sequencia(geradores.construir(gerado, GrafoLista), [0, 99], 150, rng, False)
+    print("✅ Distâncias iguais ao Dijkstra completo em todas as sequências.")
+
+    # Tempo: espaço aéreo, origens = 5 vértices de maior grau
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else "espacoaereo.txt"
+    grafo = ler_arquivo(arquivo, representacao="lista")
+    if grafo is None:
+        sys.exit(1)
+    n = len(grafo.vertices)
+    origens = sorted(range(n), key=lambda v: -len(grafo.retornar_vizinhos(v)))[:5]
+    din = SSSPDinamico(grafo, origens)
+    alteracoes = []
+    for _ in range(200):
+        u = rng.randrange(n)
+        vizinhos = list(din._saida[u])
+        if vizinhos:
+            v = rng.choice(vizinhos)
+            alteracoes.append((u, v, din._saida[u][v] * rng.choice((0.5, 1.5, 3.0))))
+
+    ini = time.perf_counter()
+    tocados = 0
+    for u, v, w in alteracoes:
+        din.alterar_aresta(u, v, w)
+        tocados += din.vertices_tocados
+    incremental = time.perf_counter() - ini
+    conferir(din, False)
+
+    ini = time.perf_counter()
+    for u, v, w in alteracoes:
+        grafo.inserir_aresta(u, v, w)
+        for s in origens:
+            grafo.dijkstra(s)
+    completo = time.perf_counter() - ini
+    print(f"{arquivo}: V={n}, {len(alteracoes)} alterações × {len(origens)} origens")
+    print(f"   incremental {incremental:.3f}s ({tocados / len(alteracoes):.1f} vértices por alteração) | "
+          f"Dijkstra completo {completo:.3f}s | {completo / incremental:.1f}x")